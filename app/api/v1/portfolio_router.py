@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.services.v1.portfolio_service import calculate_portfolio_positions
 from app.schemas.portfolio import PortfolioResponse
 from fastapi.security import OAuth2PasswordBearer
@@ -15,7 +15,7 @@ logger = get_logger()
 
 @router.post("/portfolio-position", response_model=PortfolioResponse)
 async def get_portfolio_position(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     token: str = Depends(oauth2_scheme),
 ):
     """
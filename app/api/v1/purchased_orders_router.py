@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.services.v1.purchased_orders_service import (
     place_purchased_order, 
     get_purchased_orders_by_user, 
@@ -14,6 +14,7 @@ from app.schemas.purchased_order import (
 from typing import List
 from fastapi.security import OAuth2PasswordBearer
 from app.middleware.logger import get_logger
+from app.utils.serialization import trusted_response
 
 router = APIRouter(tags=["purchased_orders"])
 
@@ -46,7 +47,7 @@ async def place_order_endpoint(
 
 @router.get("/orders/purchased", response_model=PurchasedOrdersResponse)
 async def get_purchased_orders_endpoint(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     token: str = Depends(oauth2_scheme),
     skip: int = Query(0, ge=0, description="Number of orders to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of orders to return")
@@ -56,7 +57,7 @@ async def get_purchased_orders_endpoint(
         user = await get_current_user(token, db)
         result = await get_purchased_orders_by_user(db, user, skip=skip, limit=limit)
         logger.info(f"Successfully retrieved {len(result.orders)} purchased orders for user: {user.id}")
-        return result
+        return trusted_response(result, PurchasedOrdersResponse)
     except HTTPException as e:
         logger.error(f"HTTP exception while fetching purchased orders: {str(e)}")
         raise e
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.services.v1.quality_check_service import perform_quality_checks
 from app.schemas.quality_check import QualityCheckResponse
 from fastapi.security import OAuth2PasswordBearer
@@ -19,7 +19,7 @@ logger = get_logger()
 
 @router.get("/quality-checks", response_model=QualityCheckResponse)
 async def get_quality_checks(
-    db: AsyncSession = Depends(get_db),  # Dependency injection for database session
+    db: AsyncSession = Depends(get_read_db),  # Dependency injection for database session
     token: str = Depends(oauth2_scheme),  # Extract auth token from request
 ):
     """
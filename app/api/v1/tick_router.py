@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, Query, Header, HTTPException, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
-from app.services.v1.tick_service import get_tickers, get_orders_by_tick_id, get_ohlc_data
-from app.schemas.tick import TickerSearchResponse, OrderDetailsResponse
+from app.db.session import get_read_db, read_session
+from app.services.v1.tick_service import (
+    get_tickers, get_orders_by_tick_id, get_ohlc_data, search_tickers, stream_ohlc_batch, OHLC_BATCH_MAX_TICKERS,
+    get_downsampled_series, stream_orders_export, get_ticker_symbol, EXPORT_FORMATS
+)
+from app.schemas.tick import TickerSearchResponse, OrderDetailsResponse, TickResponse, SeriesResponse
+from app.utils.serialization import trusted_response
+from app.utils.columnar import (
+    negotiate_binary_format, encode_columns, RESPONSE_MEDIA_TYPES, ORDER_COLUMN_TYPES, OHLC_COLUMN_TYPES
+)
 from typing import Optional, List
 import uuid
 from datetime import datetime
@@ -28,26 +36,30 @@ def parse_date(date_str: str) -> date:
 
 @router.get("/tickers", response_model=TickerSearchResponse)
 async def get_tickers_endpoint(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: str = Query(None),
     start_date: Optional[str] = Query(None, description="Start date for filtering (DD-MM-YYYY)"),
-    end_date: Optional[str] = Query(None, description="End date for filtering (DD-MM-YYYY)")
+    end_date: Optional[str] = Query(None, description="End date for filtering (DD-MM-YYYY)"),
+    count: str = Query("exact", pattern="^(exact|estimate|none)$", description="Total count mode: exact (cached briefly), estimate or none")
 ):
-    logger.info(f"API request to get tickers with skip={skip}, limit={limit}, search={search}")
+    logger.info(f"API request to get tickers with skip={skip}, limit={limit}, search={search}, count={count}")
     try:
         start_date_parsed = parse_date(start_date) if start_date else None
         end_date_parsed = parse_date(end_date) if end_date else None
         tickers, total, current_skip, current_limit = await get_tickers(
-            db, skip=skip, limit=limit, search=search, start_date=start_date_parsed, end_date=end_date_parsed
+            db, skip=skip, limit=limit, search=search, start_date=start_date_parsed, end_date=end_date_parsed, count=count
         )
         logger.info(f"Returning {len(tickers)} tickers")
-        return TickerSearchResponse(
-            tickers_with_dates=tickers,
-            total=total,
-            skip=current_skip,
-            limit=current_limit
+        return trusted_response(
+            TickerSearchResponse(
+                tickers_with_dates=tickers,
+                total=total,
+                skip=current_skip,
+                limit=current_limit
+            ),
+            TickerSearchResponse
         )
     except HTTPException as e:
         raise e
@@ -55,30 +67,102 @@ async def get_tickers_endpoint(
         logger.error(f"Error fetching tickers: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Declared before /tickers/{tick_id} so "search" is not parsed as a tick id
+@router.get("/tickers/search", response_model=List[TickResponse])
+async def search_tickers_endpoint(
+    q: str = Query(..., min_length=1, max_length=32, description="Ticker prefix or fragment to complete"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db)
+):
+    logger.info(f"API request to search tickers with q={q}, limit={limit}")
+    return trusted_response(await search_tickers(db, q, limit), List[TickResponse])
+
 @router.get("/tickers/{tick_id}", response_model=OrderDetailsResponse)
 async def get_orders_by_tick_id_endpoint(
     tick_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, ge=0, description="Number of orders to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of orders to return"),
-    interval: Optional[int] = Query(None, ge=0, description="Time interval in minutes to filter orders from current time")
+    interval: Optional[int] = Query(None, ge=0, description="Time interval in minutes to filter orders from current time"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces skip"),
+    include_total: bool = Query(True, description="Count all matching orders; disable for constant-time pages"),
+    accept: Optional[str] = Header(None)
 ):
     logger.info(f"API request to get orders for tick_id={tick_id}")
-    orders_data = await get_orders_by_tick_id(db, tick_id, skip=skip, limit=limit, interval=interval)
+    binary_format = negotiate_binary_format(accept)
+    orders_data = await get_orders_by_tick_id(
+        db, tick_id, skip=skip, limit=limit, interval=interval, cursor=cursor, include_total=include_total,
+        columnar=binary_format is not None
+    )
     if not orders_data:
         logger.warning(f"Ticker not found for tick_id={tick_id}")
         raise HTTPException(status_code=404, detail="Ticker not found")
     logger.info(f"Returning orders for tick_id={tick_id}")
-    return OrderDetailsResponse(**orders_data)
+    if binary_format:
+        # Page fields travel as metadata next to the order columns
+        columns = orders_data.pop("orders")
+        return Response(
+            encode_columns(binary_format, columns, ORDER_COLUMN_TYPES, orders_data),
+            media_type=RESPONSE_MEDIA_TYPES[binary_format],
+            headers={"Vary": "Accept"}
+        )
+    return trusted_response(OrderDetailsResponse(**orders_data), OrderDetailsResponse, headers={"Vary": "Accept"})
+
+@router.get("/tickers/{tick_id}/series", response_model=SeriesResponse)
+async def get_series_endpoint(
+    tick_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db),
+    points: int = Query(1000, ge=3, le=10000, description="Number of points to reduce the ltp series to"),
+    method: str = Query("lttb", pattern="^(lttb|minmax)$", description="Downsampling method: lttb or minmax"),
+    start_date: Optional[str] = Query(None, description="Start date for filtering (DD-MM-YYYY)"),
+    end_date: Optional[str] = Query(None, description="End date for filtering (DD-MM-YYYY)")
+):
+    logger.info(f"API request to get {method} series for tick_id={tick_id}, points={points}")
+    start_date_parsed = parse_date(start_date) if start_date else None
+    end_date_parsed = parse_date(end_date) if end_date else None
+    series = await get_downsampled_series(db, tick_id, points, method, start_date_parsed, end_date_parsed)
+    if not series:
+        logger.warning(f"Ticker not found for tick_id={tick_id}")
+        raise HTTPException(status_code=404, detail="Ticker not found")
+    return trusted_response(series, SeriesResponse)
+
+@router.get("/tickers/{tick_id}/export")
+async def export_orders_endpoint(
+    tick_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv"),
+    start_date: Optional[str] = Query(None, description="Start date for filtering (DD-MM-YYYY)"),
+    end_date: Optional[str] = Query(None, description="End date for filtering (DD-MM-YYYY)")
+):
+    logger.info(f"API request to export orders for tick_id={tick_id} as {format}")
+    start_date_parsed = parse_date(start_date) if start_date else None
+    end_date_parsed = parse_date(end_date) if end_date else None
+    if start_date_parsed and end_date_parsed and end_date_parsed < start_date_parsed:
+        logger.error("end_date cannot be less than start_date")
+        raise HTTPException(status_code=400, detail="end_date cannot be less than start_date")
+
+    # Resolve the ticker up front; once streaming starts the status code can no longer change
+    ticker = await get_ticker_symbol(db, tick_id)
+    if ticker is None:
+        logger.warning(f"Ticker not found for tick_id={tick_id}")
+        raise HTTPException(status_code=404, detail="Ticker not found")
+
+    return StreamingResponse(
+        stream_orders_export(tick_id, format, start_date_parsed, end_date_parsed),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{ticker}_orders.{format}"'}
+    )
 
 @router.websocket("/tickers/ws")
-async def websocket_tickers(websocket: WebSocket, db: AsyncSession = Depends(get_db)):
+async def websocket_tickers(websocket: WebSocket):
     logger.info("WebSocket connection established")
     await websocket_manager.connect(websocket)
     try:
         while True:
             try:
-                tickers, total, skip, limit = await get_tickers(db)
+                # A session per broadcast, so the socket does not hold a pooled connection between polls
+                async with read_session() as db:
+                    tickers, total, skip, limit = await get_tickers(db)
                 tickers_dict = [ticker.model_dump(mode='json') for ticker in tickers]
                 # Log the first few tickers to confirm order
                 logger.debug(f"WebSocket broadcast tickers (first 3): {tickers_dict[:3]}")
@@ -108,17 +192,56 @@ async def get_ohlc_endpoint(
     ticker: str = Query(..., description="Ticker symbol to fetch OHLC data for"),
     start_date: Optional[str] = Query(None, description="Start date for filtering (DD-MM-YYYY)"),
     end_date: Optional[str] = Query(None, description="End date for filtering (DD-MM-YYYY)"),
-    db: AsyncSession = Depends(get_db)
+    resolution: str = Query("1d", pattern="^(1m|5m|15m|1h|1d)$", description="Candle width: 1m, 5m, 15m, 1h or 1d"),
+    db: AsyncSession = Depends(get_read_db),
+    accept: Optional[str] = Header(None)
 ):
-    logger.info(f"API request to get OHLC data for ticker={ticker}")
+    logger.info(f"API request to get OHLC data for ticker={ticker}, resolution={resolution}")
     try:
         start_date_parsed = parse_date(start_date) if start_date else None
         end_date_parsed = parse_date(end_date) if end_date else None
-        ohlc_data = await get_ohlc_data(db, ticker, start_date_parsed, end_date_parsed)
+        ohlc_data = await get_ohlc_data(db, ticker, start_date_parsed, end_date_parsed, resolution)
         logger.info(f"Returning OHLC data for ticker={ticker}")
-        return ohlc_data
+        binary_format = negotiate_binary_format(accept)
+        if binary_format:
+            columns = {column: [candle[column] for candle in ohlc_data] for column in OHLC_COLUMN_TYPES}
+            return Response(
+                encode_columns(binary_format, columns, OHLC_COLUMN_TYPES, {"ticker": ticker, "resolution": resolution}),
+                media_type=RESPONSE_MEDIA_TYPES[binary_format],
+                headers={"Vary": "Accept"}
+            )
+        # The candles are plain dicts shaped like OHLCResponse; orjson encodes their dates directly
+        return ORJSONResponse(ohlc_data, headers={"Vary": "Accept"})
     except HTTPException as e:
         raise e
     except Exception as e:
         logger.error(f"Error fetching OHLC data: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/ohlc/batch")
+async def get_ohlc_batch_endpoint(
+    tickers: str = Query(..., description="Comma-separated ticker symbols"),
+    start_date: Optional[str] = Query(None, description="Start date for filtering (DD-MM-YYYY)"),
+    end_date: Optional[str] = Query(None, description="End date for filtering (DD-MM-YYYY)"),
+    accept: Optional[str] = Header(None)
+):
+    # Deduplicate while keeping the requested order
+    ticker_list = list(dict.fromkeys(ticker.strip() for ticker in tickers.split(",") if ticker.strip()))
+    logger.info(f"API request to get batch OHLC data for {len(ticker_list)} tickers")
+    if not ticker_list:
+        raise HTTPException(status_code=422, detail="At least one ticker is required")
+    if len(ticker_list) > OHLC_BATCH_MAX_TICKERS:
+        raise HTTPException(status_code=422, detail=f"At most {OHLC_BATCH_MAX_TICKERS} tickers per request")
+
+    start_date_parsed = parse_date(start_date) if start_date else None
+    end_date_parsed = parse_date(end_date) if end_date else None
+    if start_date_parsed and end_date_parsed and end_date_parsed < start_date_parsed:
+        logger.error("end_date cannot be less than start_date")
+        raise HTTPException(status_code=400, detail="end_date cannot be less than start_date")
+
+    binary_format = negotiate_binary_format(accept)
+    return StreamingResponse(
+        stream_ohlc_batch(ticker_list, start_date_parsed, end_date_parsed, binary_format),
+        media_type=RESPONSE_MEDIA_TYPES.get(binary_format, "application/json"),
+        headers={"Vary": "Accept"}
+    )
\ No newline at end of file
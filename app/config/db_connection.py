@@ -1,7 +1,7 @@
 from dotenv import load_dotenv
 import os
-from .production_db import get_db_connection as get_prod_db
-from .development_db import get_db_connection as get_dev_db
+from .production_db import get_db_connection as get_prod_db, get_replica_connections as get_prod_replicas
+from .development_db import get_db_connection as get_dev_db, get_replica_connections as get_dev_replicas
 
 # Load environment variables
 load_dotenv()
@@ -15,4 +15,15 @@ def get_db_connection():
     elif db_env == 'development':
         return get_dev_db()
     else:
-        raise ValueError(f"Unknown database environment: {db_env}")
\ No newline at end of file
+        raise ValueError(f"Unknown database environment: {db_env}")
+
+def get_replica_connections():
+    """(connection string, SSL arguments) for each configured read replica; empty when there are none."""
+    db_env = os.getenv('DB_ENV', 'development').lower()
+
+    if db_env == 'production':
+        return get_prod_replicas()
+    elif db_env == 'development':
+        return get_dev_replicas()
+    else:
+        raise ValueError(f"Unknown database environment: {db_env}")
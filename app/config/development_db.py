@@ -14,4 +14,20 @@ def get_db_connection():
         'ssl': 'require'  # Use 'require' for SSL connections
     }
     
-    return db_url, ssl_args
\ No newline at end of file
+    return db_url, ssl_args
+
+def get_replica_connections():
+    """
+    Connection strings and SSL arguments for the read replicas listed in DB_REPLICA_HOSTS
+    (comma-separated host or host:port). Replicas share the primary's credentials and database.
+    """
+    replicas = []
+    for host in os.getenv('DB_REPLICA_HOSTS', '').split(','):
+        host = host.strip()
+        if not host:
+            continue
+        if ':' not in host:
+            host = f"{host}:{os.getenv('DB_PORT')}"
+        db_url = f"postgresql+asyncpg://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{host}/{os.getenv('DB_NAME')}"
+        replicas.append((db_url, {'ssl': 'require'}))
+    return replicas
@@ -4,4 +4,8 @@ import os
 load_dotenv()
 
 def get_db_connection():
-    return os.getenv('PROD_DB_CONNECTION')
\ No newline at end of file
+    return os.getenv('PROD_DB_CONNECTION')
+
+def get_replica_connections():
+    """Read replica connection strings from PROD_DB_REPLICA_CONNECTIONS (comma-separated), without extra SSL arguments."""
+    return [(url.strip(), {}) for url in os.getenv('PROD_DB_REPLICA_CONNECTIONS', '').split(',') if url.strip()]
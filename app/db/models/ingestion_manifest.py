@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, BigInteger, Float, Text, DateTime
+from app.utils.base_model import BaseModel
+
+# Manifest statuses
+MANIFEST_IN_PROGRESS = 'in_progress'
+MANIFEST_COMPLETED = 'completed'
+MANIFEST_FAILED = 'failed'
+
+class IngestionManifest(BaseModel):
+    __tablename__ = 'ingestion_manifest'
+
+    path = Column(String, nullable=False, index=True)
+    size = Column(BigInteger, nullable=False)
+    mtime = Column(Float, nullable=True)  # Modification time of the file (of its archive for zip members)
+    content_hash = Column(String(64), nullable=False, unique=True)  # SHA-256 of the file contents
+    row_count = Column(BigInteger, nullable=False, default=0)  # Rows committed so far
+    status = Column(String, nullable=False, default=MANIFEST_IN_PROGRESS, index=True)
+    error = Column(Text, nullable=True)
+    claimed_by = Column(String, nullable=True)  # Loader run that claimed the entry last
+    first_timestamp = Column(DateTime(timezone=True), nullable=True)  # Earliest order committed so far
+    last_timestamp = Column(DateTime(timezone=True), nullable=True)  # Latest order committed so far
+
+    def __repr__(self):
+        return f"<IngestionManifest(path='{self.path}', status='{self.status}', row_count={self.row_count})>"
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Date, Float, BigInteger, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.utils.base_model import BaseModel
+
+class OhlcDaily(BaseModel):
+    __tablename__ = 'ohlc_daily'
+
+    tick_id = Column(UUID(as_uuid=True), ForeignKey('ticks.id'), nullable=False)
+    date = Column(Date, nullable=False)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(BigInteger, nullable=False, default=0)  # Sum of ltq over the day
+    # Timestamps of the orders behind open and close, so single orders can be merged in incrementally
+    first_at = Column(DateTime(timezone=True), nullable=False)
+    last_at = Column(DateTime(timezone=True), nullable=False)
+
+    # One candle per ticker per day; also serves (tick_id, date range) lookups
+    __table_args__ = (UniqueConstraint('tick_id', 'date', name='uq_ohlc_daily_tick_id_date'),)
+
+    def __repr__(self):
+        return f"<OhlcDaily(tick_id={self.tick_id}, date={self.date}, open={self.open}, high={self.high}, low={self.low}, close={self.close})>"
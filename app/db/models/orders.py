@@ -1,14 +1,17 @@
-from sqlalchemy import Column, Float, Integer, DateTime, ForeignKey, event, Index
+from datetime import datetime
+from sqlalchemy import Column, Float, Integer, DateTime, ForeignKey, event, Index, and_
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.utils.base_model import BaseModel
 from sqlalchemy.sql import func
 from .ticks import Ticks
+from app.db.partitions import ORDERS_PARTITIONED
 
 class Orders(BaseModel):
     __tablename__ = 'orders'
 
-    timestamp = Column(DateTime(timezone=True), nullable=False, default=func.now(), index=True)
+    # A partitioned table's primary key must include the partition key
+    timestamp = Column(DateTime(timezone=True), nullable=False, default=func.now(), index=True, primary_key=ORDERS_PARTITIONED)
     ltp = Column(Float, nullable=False)
     buyprice = Column(Float, nullable=False)
     buyqty = Column(Integer, nullable=False)
@@ -20,20 +23,39 @@ class Orders(BaseModel):
     # Foreign Key to link with Ticks
     tick_id = Column(UUID(as_uuid=True), ForeignKey('ticks.id'), nullable=False)
 
+    # Manifest entry of the CSV load that inserted the order (NULL for orders placed through the API)
+    ingestion_id = Column(UUID(as_uuid=True), nullable=True)
+
     # Relationship to access the related tick
     tick = relationship("Ticks", back_populates="orders", foreign_keys=[tick_id])
 
-    # Composite index for faster lookups
+    # Composite index for faster lookups; optionally range-partitioned by timestamp (see app/db/partitions.py)
     __table_args__ = (
         Index('ix_orders_tick_id_timestamp', 'tick_id', timestamp.desc()),
+        {'postgresql_partition_by': 'RANGE (timestamp)'} if ORDERS_PARTITIONED else {},
     )
 
     def __repr__(self):
         return f"<Orders(tick_id={self.tick_id}, timestamp='{self.timestamp}', ltp={self.ltp}, sellprice={self.sellprice}, sellqty={self.sellqty}, ltq={self.ltq}, openinterest={self.openinterest})>"
 
+def latest_order_condition():
+    """
+    Join condition from Ticks to its latest order. With partitioning it includes the timestamp,
+    the partition key, so the lookup is pruned to one partition instead of probing all of them.
+    """
+    if ORDERS_PARTITIONED:
+        return and_(Orders.id == Ticks.latest_order_id, Orders.timestamp == Ticks.latest_order_timestamp)
+    return Orders.id == Ticks.latest_order_id
+
 # Event listener to update the latest_order_id in Ticks when a new order is added
 @event.listens_for(Orders, 'after_insert')
 def update_latest_order_id(mapper, connection, target):
+    timestamp = target.__dict__.get('timestamp')
+    # Orders stamped with now() in SQL: now() is fixed for the transaction, so it matches the inserted row
+    if not isinstance(timestamp, datetime):
+        timestamp = func.now()
     connection.execute(
-        Ticks.__table__.update().where(Ticks.id == target.tick_id).values(latest_order_id=target.id)
+        Ticks.__table__.update()
+        .where(Ticks.id == target.tick_id)
+        .values(latest_order_id=target.id, latest_order_timestamp=timestamp)
     )
\ No newline at end of file
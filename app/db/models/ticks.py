@@ -1,20 +1,33 @@
-from sqlalchemy import Column, String, UniqueConstraint, ForeignKey
+from sqlalchemy import Column, String, DateTime, UniqueConstraint, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.utils.base_model import BaseModel
+from app.db.partitions import ORDERS_PARTITIONED
+
+# A foreign key into a partitioned orders table would have to include the partition key
+latest_order_fk = () if ORDERS_PARTITIONED else (ForeignKey('orders.id'),)
+
+# With partitioning the latest order is looked up by (id, timestamp), so only its partition is probed
+latest_order_join = (
+    "and_(Ticks.latest_order_id == Orders.id, Ticks.latest_order_timestamp == Orders.timestamp)"
+    if ORDERS_PARTITIONED else "Ticks.latest_order_id == Orders.id"
+)
 
 class Ticks(BaseModel):
     __tablename__ = 'ticks'
 
     ticker = Column(String, nullable=False, index=True)
-    latest_order_id = Column(UUID(as_uuid=True), ForeignKey('orders.id'), nullable=True)
+    latest_order_id = Column(UUID(as_uuid=True), *latest_order_fk, nullable=True)
+    latest_order_timestamp = Column(DateTime(timezone=True), nullable=True)  # Timestamp of the latest order
     __table_args__ = (UniqueConstraint('ticker', name='uq_ticks_ticker'),)  # Ensure uniqueness
 
     # Relationship to orders (one tick can have multiple orders)
     orders = relationship("Orders", back_populates="tick", cascade="all, delete-orphan", foreign_keys="Orders.tick_id")
 
     # Relationship to the latest order
-    latest_order = relationship("Orders", foreign_keys=[latest_order_id], post_update=True)
+    latest_order = relationship(
+        "Orders", primaryjoin=latest_order_join, foreign_keys=[latest_order_id, latest_order_timestamp], post_update=True
+    )
 
     def __repr__(self):
         return f"<Ticks(ticker='{self.ticker}')>"
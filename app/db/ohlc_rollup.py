@@ -0,0 +1,123 @@
+import asyncio
+import argparse
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, func, case
+from sqlalchemy.dialects.postgresql import insert, array_agg, aggregate_order_by
+from app.db.models.orders import Orders
+from app.db.models.ohlc_daily import OhlcDaily
+
+ROLLUP_COLUMNS = ['id', 'tick_id', 'date', 'open', 'high', 'low', 'close', 'volume', 'first_at', 'last_at']
+
+def rollup_select(tick_ids=None, start=None, end=None):
+    """
+    Daily candles per ticker aggregated from raw orders in one pass, in ROLLUP_COLUMNS order.
+    Optionally limited to some tick ids and to timestamps in [start, end).
+    """
+    day = func.date(Orders.timestamp)
+    query = (
+        select(
+            func.gen_random_uuid(),
+            Orders.tick_id,
+            day,
+            array_agg(aggregate_order_by(Orders.ltp, Orders.timestamp.asc()))[1],
+            func.max(Orders.ltp),
+            func.min(Orders.ltp),
+            array_agg(aggregate_order_by(Orders.ltp, Orders.timestamp.desc()))[1],
+            func.coalesce(func.sum(Orders.ltq), 0),
+            func.min(Orders.timestamp),
+            func.max(Orders.timestamp)
+        )
+        .group_by(Orders.tick_id, day)
+    )
+    if tick_ids is not None:
+        query = query.where(Orders.tick_id.in_(tick_ids))
+    if start is not None:
+        query = query.where(Orders.timestamp >= start)
+    if end is not None:
+        query = query.where(Orders.timestamp < end)
+    return query
+
+def upsert_rollup(query):
+    """INSERT the candles from a rollup_select, replacing existing ones for the same (tick_id, date)."""
+    stmt = insert(OhlcDaily).from_select(ROLLUP_COLUMNS, query)
+    return stmt.on_conflict_do_update(
+        constraint='uq_ohlc_daily_tick_id_date',
+        set_={
+            'open': stmt.excluded.open,
+            'high': stmt.excluded.high,
+            'low': stmt.excluded.low,
+            'close': stmt.excluded.close,
+            'volume': stmt.excluded.volume,
+            'first_at': stmt.excluded.first_at,
+            'last_at': stmt.excluded.last_at,
+            'updatedAt': func.now(),
+        }
+    )
+
+def refresh_ohlc_rollup(session, tick_ids, days):
+    """
+    Recompute the candles of the given ticks on the given days from their orders, e.g. after the
+    CSV loader has written a file. Each day is a timestamp range scan, so untouched days are not read.
+    """
+    if not tick_ids or not days:
+        return
+    tick_ids = list(tick_ids)
+    for day in sorted(days):
+        start = datetime.combine(day, datetime.min.time())
+        session.execute(upsert_rollup(rollup_select(tick_ids, start, start + timedelta(days=1))))
+    session.commit()
+
+def merge_order_into_rollup(tick_id, ltp, ltq):
+    """
+    Statement folding one order stamped now() into its day's candle without rescanning the day:
+    high/low widen, volume adds up, and open/close move only if the order is earlier/later.
+    """
+    stmt = insert(OhlcDaily).values(
+        tick_id=tick_id, date=func.date(func.now()), open=ltp, high=ltp, low=ltp, close=ltp,
+        volume=ltq, first_at=func.now(), last_at=func.now()
+    )
+    current = OhlcDaily.__table__.c
+    return stmt.on_conflict_do_update(
+        constraint='uq_ohlc_daily_tick_id_date',
+        set_={
+            'open': case((stmt.excluded.first_at < current.first_at, stmt.excluded.open), else_=current.open),
+            'high': func.greatest(current.high, stmt.excluded.high),
+            'low': func.least(current.low, stmt.excluded.low),
+            'close': case((stmt.excluded.last_at >= current.last_at, stmt.excluded.close), else_=current.close),
+            'volume': current.volume + stmt.excluded.volume,
+            'first_at': func.least(current.first_at, stmt.excluded.first_at),
+            'last_at': func.greatest(current.last_at, stmt.excluded.last_at),
+            'updatedAt': func.now(),
+        }
+    )
+
+async def rebuild_ohlc_rollup(start=None, end=None):
+    """
+    Backfill the rollup from all orders, or from those with start <= date <= end, then drop the
+    cached OHLC blocks of those days so requests made before the backfill are not served stale.
+    """
+    from app.db.session import engine
+    from app.utils.market_data_cache import invalidate_ohlc_range
+
+    async with engine.begin() as conn:
+        await conn.run_sync(OhlcDaily.__table__.create, checkfirst=True)
+        start_at = datetime.combine(start, datetime.min.time()) if start else None
+        end_at = datetime.combine(end + timedelta(days=1), datetime.min.time()) if end else None
+        result = await conn.execute(upsert_rollup(rollup_select(start=start_at, end=end_at)))
+    await engine.dispose()
+    invalidate_ohlc_range(start, end)
+    return result.rowcount
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the ohlc_daily rollup from the orders table")
+    parser.add_argument("--start", help="First day to rebuild (YYYY-MM-DD); default: all history")
+    parser.add_argument("--end", help="Last day to rebuild (YYYY-MM-DD); default: today")
+    args = parser.parse_args()
+
+    start = date.fromisoformat(args.start) if args.start else None
+    end = date.fromisoformat(args.end) if args.end else None
+    rows = asyncio.run(rebuild_ohlc_rollup(start, end))
+    print(f"Rebuilt {rows} daily candle(s)")
+
+if __name__ == "__main__":
+    main()
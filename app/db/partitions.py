@@ -0,0 +1,198 @@
+import os
+import re
+import asyncio
+import argparse
+from datetime import date, datetime, timedelta
+from sqlalchemy import text
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Declarative range partitioning of the orders table: 'none', 'day' or 'month'
+ORDERS_PARTITIONING = os.getenv("ORDERS_PARTITIONING", "none").lower()
+if ORDERS_PARTITIONING not in ('none', 'day', 'month'):
+    raise ValueError(f"Unknown ORDERS_PARTITIONING: {ORDERS_PARTITIONING}. Use 'none', 'day' or 'month'.")
+
+ORDERS_PARTITIONED = ORDERS_PARTITIONING != 'none'
+
+# How far ahead of today partitions are created at startup, in partition periods
+PARTITION_PREMAKE = int(os.getenv("ORDERS_PARTITION_PREMAKE", 7))
+
+PARTITION_NAME_PATTERN = re.compile(r"^orders_p(\d{8}|\d{6})$")
+
+# Catches rows whose period has no partition yet, so inserts never fail for a missing partition
+DEFAULT_PARTITION = "orders_default"
+
+# Partitions created (or confirmed) by this process, so each is only issued once
+created_partitions = set()
+
+def partition_start(value):
+    """Return the first day of the partition period containing a date or datetime."""
+    day = value.date() if isinstance(value, datetime) else value
+    return day.replace(day=1) if ORDERS_PARTITIONING == 'month' else day
+
+def next_partition_start(start):
+    """Return the first day of the partition period following the one starting at start."""
+    if ORDERS_PARTITIONING == 'month':
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+def partition_name(start):
+    """Name of the partition for a period, e.g. orders_p20220405 (day) or orders_p202204 (month)."""
+    return f"orders_p{start:%Y%m}" if ORDERS_PARTITIONING == 'month' else f"orders_p{start:%Y%m%d}"
+
+def ensure_default_partition(connection):
+    """Create the DEFAULT orders partition if it does not exist (sync Connection)."""
+    connection.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF orders DEFAULT"))
+
+def ensure_latest_order_timestamps(connection):
+    """
+    Add ticks.latest_order_timestamp to databases created before it existed and fill it in for
+    ticks that already point at an order, so partitioned lookups of the latest order can prune
+    (sync Connection).
+    """
+    connection.execute(text("ALTER TABLE ticks ADD COLUMN IF NOT EXISTS latest_order_timestamp TIMESTAMP WITH TIME ZONE"))
+    connection.execute(text(
+        'UPDATE ticks SET latest_order_timestamp = orders."timestamp" FROM orders '
+        "WHERE orders.id = ticks.latest_order_id AND ticks.latest_order_timestamp IS NULL"
+    ))
+
+def create_order_partition(connection, start):
+    """
+    Create the orders partition for the period beginning at start if it does not exist.
+    Rows of that period already in the DEFAULT partition are moved into the new partition, since
+    PostgreSQL refuses to create a partition whose range the default partition holds rows for.
+    Runs on a sync Connection (use run_sync from async code). An advisory transaction lock
+    serialises concurrent creators of the same partition.
+    """
+    name = partition_name(start)
+    bounds = {"start": start, "end": next_partition_start(start)}
+    connection.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": name})
+    if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+        return
+
+    stray_rows = (
+        connection.execute(text("SELECT to_regclass(:name)"), {"name": DEFAULT_PARTITION}).scalar() is not None
+        and connection.execute(text(
+            f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE "timestamp" >= :start AND "timestamp" < :end)'
+        ), bounds).scalar()
+    )
+    if stray_rows:
+        connection.execute(text("CREATE TEMP TABLE orders_moved (LIKE orders)"))
+        connection.execute(text(
+            f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE "timestamp" >= :start AND "timestamp" < :end RETURNING *) '
+            f"INSERT INTO orders_moved SELECT * FROM moved"
+        ), bounds)
+
+    connection.execute(text(
+        f"CREATE TABLE {name} PARTITION OF orders "
+        f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+    ))
+
+    if stray_rows:
+        connection.execute(text("INSERT INTO orders SELECT * FROM orders_moved"))
+        connection.execute(text("DROP TABLE orders_moved"))
+
+def ensure_order_partitions(engine, timestamps):
+    """
+    Make sure a partition exists for every timestamp, creating missing ones in their own short
+    transactions before rows are inserted. A no-op when partitioning is disabled.
+    """
+    if not ORDERS_PARTITIONED:
+        return
+    missing = {partition_start(timestamp) for timestamp in timestamps} - created_partitions
+    for start in sorted(missing):
+        with engine.begin() as connection:
+            create_order_partition(connection, start)
+        created_partitions.add(start)
+
+async def ensure_current_order_partition():
+    """
+    Make sure the current period's partition exists before the API inserts an order stamped now(),
+    so a server running longer than the premade periods keeps writing to a real partition.
+    Checked against this process's cache first, so it costs a query only once per period.
+    """
+    if not ORDERS_PARTITIONED:
+        return
+    start = partition_start(date.today())
+    if start in created_partitions:
+        return
+    from app.db.session import engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(create_order_partition, start)
+    created_partitions.add(start)
+
+def ensure_upcoming_partitions(connection, periods=PARTITION_PREMAKE):
+    """
+    Create the DEFAULT partition and partitions for the current period and the next `periods`
+    periods (sync Connection).
+    """
+    if not ORDERS_PARTITIONED:
+        return
+    ensure_default_partition(connection)
+    start = partition_start(date.today())
+    for _ in range(periods + 1):
+        create_order_partition(connection, start)
+        created_partitions.add(start)
+        start = next_partition_start(start)
+
+def list_order_partitions(connection):
+    """Return {partition_name: period_start} for every attached orders partition (sync Connection)."""
+    rows = connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'orders'"
+    ))
+    partitions = {}
+    for (name,) in rows:
+        match = PARTITION_NAME_PATTERN.match(name)
+        if match:
+            digits = match.group(1)
+            partitions[name] = datetime.strptime(digits, "%Y%m%d" if len(digits) == 8 else "%Y%m").date()
+    return partitions
+
+def detach_order_partitions(connection, before, drop=False):
+    """
+    Retention: detach every orders partition whose whole period ends on or before `before`,
+    optionally dropping it. Detaching is a metadata change, unlike a bulk DELETE.
+    Returns the names of the partitions detached.
+    """
+    detached = []
+    for name, start in sorted(list_order_partitions(connection).items(), key=lambda item: item[1]):
+        if next_partition_start(start) > before:
+            continue
+        connection.execute(text(f"ALTER TABLE orders DETACH PARTITION {name}"))
+        if drop:
+            connection.execute(text(f"DROP TABLE {name}"))
+        created_partitions.discard(start)
+        detached.append(name)
+    return detached
+
+async def run_maintenance(before=None, drop=False):
+    """Create upcoming partitions and, if `before` is given, detach older ones."""
+    from app.db.session import engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(ensure_upcoming_partitions)
+        detached = await conn.run_sync(detach_order_partitions, before, drop) if before else []
+    await engine.dispose()
+    return detached
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain range partitions of the orders table")
+    parser.add_argument("--detach-before", help="Detach partitions that end on or before this date (YYYY-MM-DD)")
+    parser.add_argument("--drop", action="store_true", help="Drop partitions after detaching them")
+    args = parser.parse_args()
+
+    if not ORDERS_PARTITIONED:
+        print("ORDERS_PARTITIONING is 'none'; nothing to do.")
+        return
+
+    before = date.fromisoformat(args.detach_before) if args.detach_before else None
+    detached = asyncio.run(run_maintenance(before, args.drop))
+    print(f"Upcoming partitions ensured. Detached {len(detached)} partition(s): {', '.join(detached) or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import time
+import asyncio
+from contextlib import AsyncExitStack
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Connections kept open per engine, and extra ones opened under load (closed again when returned)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+
+# Seconds a checkout waits for a free connection before raising
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+
+# Connections older than this many seconds are replaced, before the server or a proxy drops them
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+
+# Test each connection on checkout, so a dropped one is replaced instead of failing the request
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Connections opened per engine at startup, so the first requests skip the TLS handshake
+DB_POOL_WARMUP = min(int(os.getenv("DB_POOL_WARMUP", DB_POOL_SIZE)), DB_POOL_SIZE)
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long checkouts take (waiting for a free connection,
+    opening a new one and the pre-ping) and how many time out.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+    def metrics(self) -> dict:
+        return {
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            # overflow() counts up from -pool_size; only connections beyond the pool size are overflow
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_ms_avg": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+        }
+
+def pool_settings() -> dict:
+    """Keyword arguments for create_async_engine that apply the DB_POOL_* settings."""
+    return {
+        "poolclass": MeteredQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+async def warm_up_pool(engine, connections: int = DB_POOL_WARMUP) -> int:
+    """
+    Open `connections` connections concurrently and return them to the pool, where they stay open.
+    Returns how many were opened; failures are left to the first requests to surface.
+    """
+    async with AsyncExitStack() as stack:
+        results = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections)),
+            return_exceptions=True
+        )
+    return sum(1 for result in results if not isinstance(result, BaseException))
+
+def pool_metrics(engine) -> dict:
+    """Metrics of an engine's pool; engines without a MeteredQueuePool only report their status line."""
+    pool = engine.pool
+    return pool.metrics() if isinstance(pool, MeteredQueuePool) else {"status": pool.status()}
@@ -0,0 +1,5 @@
+from sqlalchemy import text
+
+def upgrade_orders_table(connection):
+    """Add the orders columns introduced after the table was first created, if they are missing (sync Connection)."""
+    connection.execute(text("ALTER TABLE orders ADD COLUMN IF NOT EXISTS ingestion_id UUID"))
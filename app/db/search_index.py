@@ -0,0 +1,21 @@
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from app.middleware.logger import get_logger
+
+logger = get_logger()
+
+TICKER_TRGM_INDEX = "ix_ticks_ticker_trgm"
+
+def ensure_ticker_search_index(connection):
+    """
+    Create the pg_trgm GIN index that serves ILIKE '%term%' ticker search (sync Connection).
+    Databases without the pg_trgm extension keep working on the b-tree index, with a warning.
+    """
+    try:
+        with connection.begin_nested():
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {TICKER_TRGM_INDEX} ON ticks USING gin (ticker gin_trgm_ops)"
+            ))
+    except DBAPIError as e:
+        logger.warning(f"Ticker trigram index not created, substring search will scan ticks: {e.orig}")
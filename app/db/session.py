@@ -1,27 +1,86 @@
+import asyncio
+import itertools
+from fastapi.requests import HTTPConnection
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from app.config.db_connection import get_db_connection
+from app.config.db_connection import get_db_connection, get_replica_connections
 from app.utils.base_model import Base
+from app.db.partitions import ensure_upcoming_partitions, ensure_latest_order_timestamps
+from app.db.search_index import ensure_ticker_search_index
+from app.db.schema_upgrades import upgrade_orders_table
+from app.db.pool import pool_settings, warm_up_pool, pool_metrics
+from app.utils.primary_pins import bearer_user_id, is_pinned_to_primary
 
 # Get the database connection string and SSL arguments
 db_connection_string, ssl_args = get_db_connection()
 
-# Create the async engine with the connection string and SSL arguments
-engine = create_async_engine(db_connection_string, connect_args=ssl_args)
+# Create the async engine with the connection string, SSL arguments and DB_POOL_* pool settings
+engine = create_async_engine(db_connection_string, connect_args=ssl_args, **pool_settings())
 
 # Create a configured "AsyncSessionLocal" class
 AsyncSessionLocal = sessionmaker(
     autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
 )
 
-# Create all tables in the database
+# Optional streaming read replicas (DB_REPLICA_HOSTS); read sessions take them in turn
+replica_engines = [
+    create_async_engine(replica_connection_string, connect_args=replica_ssl_args, **pool_settings())
+    for replica_connection_string, replica_ssl_args in get_replica_connections()
+]
+next_replica = itertools.cycle(replica_engines)
+
+def read_session(pinned: bool = False) -> AsyncSession:
+    """
+    A session for read-only work, bound to the next replica in turn. Falls back to the primary when
+    no replicas are configured or the caller is pinned to it after a write (see app/utils/primary_pins.py).
+    """
+    if pinned or not replica_engines:
+        return AsyncSessionLocal()
+    return AsyncSessionLocal(bind=next(next_replica))
+
+def named_engines():
+    """The primary and replica engines by name, as used in pool metrics."""
+    return {"primary": engine, **{f"replica_{i}": replica for i, replica in enumerate(replica_engines)}}
+
+async def warm_up_engines():
+    """Fill the pools of the primary and replicas at startup; returns the connections opened per engine."""
+    names, engines = zip(*named_engines().items())
+    opened = await asyncio.gather(*(warm_up_pool(db_engine) for db_engine in engines))
+    return dict(zip(names, opened))
+
+def engine_pool_metrics():
+    """Checkout wait times, in-use counts and overflow of every engine's pool."""
+    return {name: pool_metrics(db_engine) for name, db_engine in named_engines().items()}
+
+async def dispose_engines():
+    for db_engine in named_engines().values():
+        await db_engine.dispose()
+
+# Create all tables in the database, the ticker search index, and upcoming orders partitions
+# when partitioning is enabled
 async def create_tables():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(ensure_ticker_search_index)
+        await conn.run_sync(ensure_upcoming_partitions)
+        await conn.run_sync(ensure_latest_order_timestamps)
+        await conn.run_sync(upgrade_orders_table)
 
-# Dependency to get the database session
+# Dependency to get the database session (primary; use it for anything that writes)
 async def get_db():
     db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+# Dependency for read-only endpoints: a replica session, unless the caller's token is pinned to the primary
+async def get_read_db(connection: HTTPConnection):
+    pinned = False
+    if replica_engines:
+        user_id = bearer_user_id(connection.headers.get("authorization"))
+        pinned = user_id is not None and is_pinned_to_primary(user_id)
+    db = read_session(pinned)
     try:
         yield db
     finally:
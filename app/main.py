@@ -1,4 +1,6 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
 from app.api.v1.tick_router import router as tick_router
 from app.api.v1.user_router import router as user_router
 from app.api.v1.purchased_orders_router import router as order_router
@@ -10,14 +12,16 @@ from app.middleware.timeout import setup_timeout
 from app.middleware.logger import get_logger
 from app.middleware.rate_limit import setup_rate_limit
 from app.middleware.error_handler import error_handler
+from app.db.session import engine, engine_pool_metrics
 
-app = FastAPI()
+# Routes that return models or dicts (rather than a Response) are encoded with orjson
+app = FastAPI(default_response_class=ORJSONResponse)
 logger = get_logger()
 
 # Setup middleware
 setup_cors(app)
 setup_gzip(app)
-setup_timeout(app, timeout=10)
+setup_timeout(app, timeout=10, exempt_path_suffixes=("/export",))  # Streaming exports run as long as they need
 setup_rate_limit(app, limit=100, window=60) 
 app.middleware("http")(error_handler)
 
@@ -44,4 +48,18 @@ async def root():
 @app.get("/health")
 async def health_check():
     logger.info("Health check endpoint accessed")
-    return {"status": "healthy", "message": "All services are running"}
\ No newline at end of file
+    return {"status": "healthy", "message": "All services are running"}
+
+@app.get("/health/db")
+async def database_health_check():
+    """Check the primary database on the application's pool and report the pool metrics of every engine."""
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.error(f"Database health check failed: {str(e)}")
+        return ORJSONResponse(
+            status_code=503,
+            content={"status": "unhealthy", "message": "Database unavailable", "pools": engine_pool_metrics()}
+        )
+    return {"status": "healthy", "pools": engine_pool_metrics()}
\ No newline at end of file
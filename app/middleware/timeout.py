@@ -8,17 +8,23 @@ from app.middleware.logger import get_logger
 logger = get_logger()
 
 class TimeoutMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, timeout: int = 30):
+    def __init__(self, app, timeout: int = 30, exempt_path_suffixes: tuple = ()):
         """
-        Initialize the timeout middleware with a default timeout of 30 seconds
+        Initialize the timeout middleware with a default timeout of 30 seconds.
+        Requests whose path ends with one of exempt_path_suffixes (long-running exports) are not timed.
         """
         super().__init__(app)
         self.timeout = timeout
+        self.exempt_path_suffixes = tuple(exempt_path_suffixes)
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """
         Dispatch the request with timeout handling
         """
+        if self.exempt_path_suffixes and request.url.path.endswith(self.exempt_path_suffixes):
+            logger.info(f"Processing request without timeout: {request.method} {request.url.path}")
+            return await call_next(request)
+
         try:
             # Log the request start
             logger.info(f"Processing request: {request.method} {request.url.path}")
@@ -45,9 +51,9 @@ class TimeoutMiddleware(BaseHTTPMiddleware):
             logger.error(f"Error processing request {request.method} {request.url.path}: {str(e)}")
             raise
 
-def setup_timeout(app, timeout: int = 10):
+def setup_timeout(app, timeout: int = 10, exempt_path_suffixes: tuple = ()):
     """
     Helper function to add timeout middleware to the FastAPI app
     """
-    app.add_middleware(TimeoutMiddleware, timeout=timeout)
-    logger.info(f"Timeout middleware configured with {timeout}s timeout")
\ No newline at end of file
+    app.add_middleware(TimeoutMiddleware, timeout=timeout, exempt_path_suffixes=exempt_path_suffixes)
+    logger.info(f"Timeout middleware configured with {timeout}s timeout, exempt: {', '.join(exempt_path_suffixes) or 'none'}")
\ No newline at end of file
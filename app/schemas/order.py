@@ -19,8 +19,8 @@ class OrderResponse(BaseSchema):
 
     @classmethod
     def from_orm(cls, obj):
-        formatted_date = obj.timestamp.strftime("%d/%m/%Y") if obj.timestamp else None
-        formatted_time = obj.timestamp.strftime("%H:%M:%S") if obj.timestamp else None
+        """Build from an Orders row; date and time are cut from one isoformat() instead of formatting three times."""
+        timestamp = obj.timestamp.isoformat() if obj.timestamp else None
         return cls(
             id=obj.id,
             ltp=obj.ltp,
@@ -31,7 +31,7 @@ class OrderResponse(BaseSchema):
             tick_id=obj.tick_id,
             buyprice=obj.buyprice,
             buyqty=obj.buyqty,
-            timestamp=obj.timestamp.isoformat() if obj.timestamp else None,
-            date=formatted_date,
-            time=formatted_time
-        )
\ No newline at end of file
+            timestamp=timestamp,
+            date=f"{timestamp[8:10]}/{timestamp[5:7]}/{timestamp[:4]}" if timestamp else None,
+            time=timestamp[11:19] if timestamp else None
+        )
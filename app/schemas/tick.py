@@ -1,4 +1,4 @@
-from pydantic import validator, Field
+from pydantic import Field
 from typing import List, Optional
 import uuid
 from datetime import datetime, date
@@ -14,10 +14,23 @@ class OrderDetailsResponse(BaseSchema):
     """Response schema containing order details for a specific ticker."""
     ticker: str
     orders: List[OrderResponse]
-    total: int
+    total: Optional[int] = Field(default=None, description="Total matching orders; omitted when include_total is false")
     skip: int
     limit: int
     interval: Optional[int] = Field(default=None, description="Time interval in minutes for filtering orders")
+    next_cursor: Optional[str] = Field(default=None, description="Pass as cursor to fetch the next page; null on the last page")
+
+class SeriesPoint(BaseSchema):
+    """A single point of a downsampled price series."""
+    timestamp: datetime
+    ltp: float
+
+class SeriesResponse(BaseSchema):
+    """Response schema for a ticker's ltp series reduced to a fixed number of points."""
+    ticker: str
+    method: str = Field(description="Downsampling method: lttb or minmax")
+    source_points: int = Field(description="Number of orders the series was reduced from")
+    points: List[SeriesPoint]
 
 class TickerWithDates(BaseSchema):
     """Schema for ticker details along with historical data."""
@@ -28,21 +41,12 @@ class TickerWithDates(BaseSchema):
     sellprice: Optional[float] = Field(default=None, description="Selling price of the shares")
     ltp: Optional[float] = Field(default=None, description="Last traded price")
     ltq: Optional[int] = Field(default=None, description="Last traded quantity")
-    latest_timestamp: Optional[str] = Field(default=None, description="Timestamp of the most recent trade")
-
-    @validator('id', 'latest_timestamp', pre=True)
-    def convert_uuid_and_datetime(cls, value):
-        """Ensure UUIDs are converted to strings and datetime objects are formatted as ISO strings."""
-        if isinstance(value, uuid.UUID):
-            return str(value)
-        if isinstance(value, datetime):
-            return value.isoformat()
-        return value
+    latest_timestamp: Optional[str] = Field(default=None, description="Timestamp of the most recent trade (ISO 8601)")
 
 class TickerSearchResponse(BaseSchema):
     """Response schema for paginated ticker search results."""
     tickers_with_dates: List[TickerWithDates]
-    total: int
+    total: Optional[int] = Field(default=None, description="Total matching tickers; estimated or omitted depending on the count mode")
     skip: int
     limit: int
 
@@ -50,6 +54,7 @@ class OHLCResponse(BaseSchema):
     """Schema representing Open, High, Low, and Close (OHLC) price data for a ticker."""
     ticker: str
     date: date
+    timestamp: Optional[datetime] = Field(default=None, description="Start of the candle for intraday resolutions")
     open: float
     high: float
     low: float
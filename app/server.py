@@ -1,20 +1,15 @@
 import os
 import uvicorn
 import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy import text
-from app.config.db_connection import get_db_connection
 from app.main import app
-from app.db.session import create_tables
+from app.db.session import engine, create_tables, warm_up_engines, dispose_engines
 
 async def check_db_connection():
     """
-    Check if the database connection is valid using the connection string and SSL args.
+    Check if the database connection is valid, on the application's engine so the connection joins its pool.
     """
     try:
-        db_connection_string, ssl_args = get_db_connection()
-        
-        engine = create_async_engine(db_connection_string, connect_args=ssl_args)
         async with engine.connect() as connection:
             await connection.execute(text("SELECT 1"))
         print("Database connection established successfully.")
@@ -39,11 +34,19 @@ async def startup_event():
         print(f"Error creating tables: {e}")
         raise RuntimeError("Server startup halted due to table creation failure.")
 
+    # Open the pooled connections up front, so the first requests do not pay for them
+    warmed = await warm_up_engines()
+    print(f"Database connection pools warmed up: {warmed}")
+
 # Startup event to the FastAPI app
 @app.on_event("startup")
 async def startup():
     await startup_event()
 
+@app.on_event("shutdown")
+async def shutdown():
+    await dispose_engines()
+
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))  
@@ -9,7 +9,11 @@ from app.schemas.purchased_order import PurchasedOrderCreate, PurchasedOrderResp
 from app.middleware.jwt import JWTHandler
 from app.middleware.logger import get_logger
 from app.config.redis_client_connection import redis_client
-from datetime import datetime
+from app.db.ohlc_rollup import merge_order_into_rollup
+from app.db.partitions import ensure_current_order_partition
+from app.utils.market_data_cache import invalidate_ohlc_days
+from app.utils.primary_pins import pin_to_primary
+from datetime import datetime, date
 import uuid
 import json
 from sqlalchemy.orm import joinedload
@@ -64,6 +68,7 @@ async def place_purchased_order(db: AsyncSession, order: PurchasedOrderCreate, u
 
     # Create a new order with updated ltq (default to full qty if no previous order)
     from app.db.models.orders import Orders
+    await ensure_current_order_partition()
     new_order = Orders(
         timestamp=func.now(),
         ltp=latest_order.ltp if latest_order else 0.0,
@@ -97,6 +102,9 @@ async def place_purchased_order(db: AsyncSession, order: PurchasedOrderCreate, u
     # Update tick.latest_order_id with the new order ID
     tick.latest_order_id = new_order_id
 
+    # Fold the new order into today's daily candle in the same transaction
+    await db.execute(merge_order_into_rollup(tick_id, new_order.ltp, new_order.ltq))
+
     # Single commit for all changes
     await db.commit()
 
@@ -119,6 +127,12 @@ async def place_purchased_order(db: AsyncSession, order: PurchasedOrderCreate, u
         redis_client.delete(*cache_keys)
         logger.info(f"Cache invalidated for keys: {cache_keys}")
 
+    # The new order changes today's candles for this ticker
+    invalidate_ohlc_days([tick.ticker], [date.today()])
+
+    # Keep this user's reads on the primary until the replicas have the order
+    pin_to_primary(user_id)
+
     # Return response using pre-fetched values
     return PurchasedOrderResponse(
         id=str(db_order_id),
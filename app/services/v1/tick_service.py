@@ -1,35 +1,103 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text, and_, or_, literal, literal_column, union_all, DateTime
+from sqlalchemy.dialects.postgresql import array_agg, aggregate_order_by
 from app.db.models.ticks import Ticks
-from app.db.models.orders import Orders
+from app.db.models.orders import Orders, latest_order_condition
+from app.db.models.ohlc_daily import OhlcDaily
 from typing import List, Optional, Tuple
 import uuid
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, timedelta, timezone
 from app.schemas.tick import TickerWithDates, OrderResponse
 from fastapi import HTTPException
+import io
 import os
+import csv
+import json
+import time
+import base64
+import binascii
 from dotenv import load_dotenv
 from app.middleware.websocket_manager import websocket_manager
 from app.middleware.logger import get_logger
-from app.schemas.tick import OHLCResponse
+from app.schemas.tick import TickResponse, SeriesResponse, SeriesPoint
+from app.utils.downsample import StreamingDownsampler, np
+from app.utils.ticker_prefix_index import ticker_prefix_index
+from app.utils.columnar import (
+    ArrowStreamEncoder,
+    ORDER_COLUMN_TYPES,
+    OHLC_COLUMN_TYPES,
+    columns_from_rows,
+    msgpack_packer,
+)
+from app.utils.market_data_cache import (
+    days_between,
+    get_cached_ohlc_days,
+    cache_ohlc_days,
+    get_cached_orders_page,
+    cache_orders_page,
+)
 
 load_dotenv()
 
 logger = get_logger()
 
-async def get_tickers(
-    db: AsyncSession,
-    skip: int = 0,
-    limit: int = 100,
-    search: str = None,
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None
-) -> Tuple[List[TickerWithDates], int, int, int]:
-    logger.info(f"Fetching tickers with skip={skip}, limit={limit}, search={search}, start_date={start_date}, end_date={end_date}")
-    if start_date and end_date and end_date < start_date:
-        logger.error("end_date cannot be less than start_date")
-        raise HTTPException(status_code=400, detail="end_date cannot be less than start_date")
+# Ways /tickers can compute its total: exact (cached), planner estimate, or not at all
+COUNT_MODES = ('exact', 'estimate', 'none')
+
+# Seconds an exact ticker count is reused for the same search and date range
+TICKERS_COUNT_TTL = float(os.getenv("TICKERS_COUNT_TTL", 30))
+
+# (search, start_date, end_date) -> (expires_at, count)
+tickers_count_cache = {}
+
+# Candle widths served by /ohlc; 1d comes from the ohlc_daily rollup, the rest are bucketed from orders
+OHLC_RESOLUTIONS = {
+    '1m': timedelta(minutes=1),
+    '5m': timedelta(minutes=5),
+    '15m': timedelta(minutes=15),
+    '1h': timedelta(hours=1),
+    '1d': timedelta(days=1),
+}
+
+# Longest date range, in days, an intraday request may span
+OHLC_MAX_INTRADAY_DAYS = {'1m': 7, '5m': 31, '15m': 93, '1h': 366}
+
+# Rows fetched per round trip when streaming a price series for downsampling
+SERIES_CHUNK_SIZE = 20_000
+
+# Rows fetched per round trip, and written per response chunk, by the order history export
+EXPORT_CHUNK_SIZE = 10_000
+
+# Export formats and their media types
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+# Orders columns written by the export, in CSV column order
+EXPORT_COLUMNS = ['timestamp', 'ltp', 'buyprice', 'buyqty', 'sellprice', 'sellqty', 'ltq', 'openinterest']
+
+# Most tickers one /ohlc/batch request may ask for
+OHLC_BATCH_MAX_TICKERS = 500
+
+def latest_quotes_query():
+    """
+    Latest quote per ticker read through the maintained Ticks.latest_order_id pointer:
+    one primary-key lookup per ticker instead of a window over the whole orders table.
+    """
+    return (
+        select(
+            Ticks.id,
+            Ticks.ticker,
+            Orders.timestamp,
+            Orders.sellqty,
+            Orders.sellprice,
+            Orders.ltp,
+            Orders.ltq
+        )
+        .join(Orders, latest_order_condition())
+        .order_by(Orders.timestamp.desc())
+    )
 
+def windowed_quotes_query(start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """Latest quote per ticker within a date range, computed with row_number() over the filtered orders."""
     # Subquery to get the latest order per tick with necessary fields
     subquery = (
         select(
@@ -52,7 +120,7 @@ async def get_tickers(
     )
 
     # Main query to join Ticks with the latest orders, ordered by latest timestamp
-    query = (
+    return (
         select(
             Ticks.id,
             Ticks.ticker,
@@ -65,10 +133,31 @@ async def get_tickers(
         .join(subquery, Ticks.id == subquery.c.tick_id)
         .where(subquery.c.rn == 1)
         .order_by(subquery.c.timestamp.desc())  # Changed to order by latest timestamp
-        .offset(skip)
-        .limit(limit)
     )
 
+async def get_tickers(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    search: str = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    count: str = 'exact'
+) -> Tuple[List[TickerWithDates], Optional[int], int, int]:
+    logger.info(f"Fetching tickers with skip={skip}, limit={limit}, search={search}, start_date={start_date}, end_date={end_date}, count={count}")
+    if start_date and end_date and end_date < start_date:
+        logger.error("end_date cannot be less than start_date")
+        raise HTTPException(status_code=400, detail="end_date cannot be less than start_date")
+    if count not in COUNT_MODES:
+        logger.error(f"Invalid count mode: {count}")
+        raise HTTPException(status_code=400, detail=f"count must be one of: {', '.join(COUNT_MODES)}")
+
+    if start_date or end_date:
+        query = windowed_quotes_query(start_date, end_date)
+    else:
+        query = latest_quotes_query()
+
+    query = query.offset(skip).limit(limit)
     if search:
         query = query.where(Ticks.ticker.ilike(f"%{search}%"))
 
@@ -80,10 +169,9 @@ async def get_tickers(
     for tick_id, ticker, timestamp, sellqty, sellprice, ltp, ltq in ticks:
         latest_date = timestamp.strftime("%d-%m-%Y") if timestamp else None
         ticker_with_dates = TickerWithDates(
-            id=str(tick_id),
+            id=tick_id,
             ticker=ticker,
             dates=[latest_date] if latest_date else [],
-            interval=None,
             sellqty=sellqty,
             sellprice=sellprice,
             ltp=ltp,
@@ -92,10 +180,36 @@ async def get_tickers(
         )
         results.append(ticker_with_dates)
 
-    total = await get_total_tickers_count(db, search, start_date, end_date)
+    if count == 'none':
+        total = None
+    elif count == 'estimate':
+        total = await get_estimated_tickers_count(db, search, start_date, end_date)
+    else:
+        total = await get_cached_tickers_count(db, search, start_date, end_date)
     logger.info(f"Total tickers count: {total}")
     return results, total, skip, limit
 
+async def search_tickers(db: AsyncSession, q: str, limit: int = 10) -> List[TickResponse]:
+    """
+    Autocomplete: symbols starting with q from the in-process prefix index, topped up with
+    substring matches (served by the pg_trgm index) when there are fewer than limit.
+    """
+    logger.info(f"Searching tickers for q={q}, limit={limit}")
+    matches = await ticker_prefix_index.search(db, q, limit)
+
+    if len(matches) < limit:
+        seen = {tick_id for tick_id, _ in matches}
+        query = (
+            select(Ticks.id, Ticks.ticker)
+            .where(Ticks.ticker.ilike(f"%{q}%"))
+            .order_by(Ticks.ticker)
+            .limit(limit + len(matches))
+        )
+        result = await db.execute(query)
+        matches += [(tick_id, ticker) for tick_id, ticker in result.all() if tick_id not in seen][:limit - len(matches)]
+
+    return [TickResponse(id=tick_id, ticker=ticker) for tick_id, ticker in matches]
+
 async def get_total_tickers_count(
     db: AsyncSession,
     search: str = None,
@@ -103,31 +217,22 @@ async def get_total_tickers_count(
     end_date: Optional[date] = None
 ) -> int:
     """
-    Get the total count of distinct tickers, optionally filtered by search and date range.
+    Get the exact count of tickers /tickers can list, optionally filtered by search and date range.
     """
-    # Subquery to get distinct tickers
-    subquery = (
-        select(Ticks.ticker)
-        .distinct()
-        .subquery()
-    )
-
-    # Base query to count distinct tickers
-    query = select(func.count()).select_from(subquery)
-
-    # Apply search filter
-    if search:
-        query = query.where(subquery.c.ticker.ilike(f"%{search}%"))
-
-    # Apply date filters
     if start_date or end_date:
-        # Join the Orders table with the Ticks table
-        query = query.join(Ticks, subquery.c.ticker == Ticks.ticker)
-        query = query.join(Orders, Ticks.id == Orders.tick_id)
+        # Tickers with at least one order in the range, matching windowed_quotes_query
+        query = select(func.count(func.distinct(Orders.tick_id)))
         if start_date:
             query = query.where(Orders.timestamp >= start_date)
         if end_date:
             query = query.where(Orders.timestamp <= end_date)
+        if search:
+            query = query.join(Ticks, Ticks.id == Orders.tick_id).where(Ticks.ticker.ilike(f"%{search}%"))
+    else:
+        # Tickers with a latest quote, matching latest_quotes_query
+        query = select(func.count(Ticks.id)).where(Ticks.latest_order_id.isnot(None))
+        if search:
+            query = query.where(Ticks.ticker.ilike(f"%{search}%"))
 
     # Execute the query and return the count
     result = await db.execute(query)
@@ -135,21 +240,95 @@ async def get_total_tickers_count(
     logger.debug(f"Computed total tickers count: {count}")
     return count
 
+async def get_cached_tickers_count(
+    db: AsyncSession,
+    search: str = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> int:
+    """
+    Exact ticker count, reused for TICKERS_COUNT_TTL seconds per (search, date range) so that
+    paging through results and the WebSocket loop do not recount on every call.
+    """
+    key = (search, start_date, end_date)
+    now = time.monotonic()
+    cached = tickers_count_cache.get(key)
+    if cached and cached[0] > now:
+        logger.debug(f"Tickers count cache hit for key={key}")
+        return cached[1]
+
+    count = await get_total_tickers_count(db, search, start_date, end_date)
+    # Drop expired entries so one-off searches do not accumulate
+    for stale_key in [k for k, (expires_at, _) in tickers_count_cache.items() if expires_at <= now]:
+        del tickers_count_cache[stale_key]
+    tickers_count_cache[key] = (now + TICKERS_COUNT_TTL, count)
+    return count
+
+async def get_estimated_tickers_count(
+    db: AsyncSession,
+    search: str = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> int:
+    """
+    Approximate ticker count from the planner statistics without scanning ticks. Like the exact
+    count, it only counts ticks with orders: the table's row estimate (pg_class.reltuples) is scaled
+    by the share of rows whose latest_order_id is set (pg_stats.null_frac).
+    Filtered requests have no statistic to read, so they fall back to the cached exact count,
+    as does a ticks table that has never been analyzed.
+    """
+    if not (search or start_date or end_date):
+        result = await db.execute(text(
+            "SELECT (c.reltuples * (1 - s.null_frac))::bigint "
+            "FROM pg_class c "
+            "JOIN pg_stats s ON s.schemaname = current_schema() AND s.tablename = 'ticks' "
+            "AND s.attname = 'latest_order_id' "
+            "WHERE c.oid = 'ticks'::regclass"
+        ))
+        estimate = result.scalar()
+        if estimate is not None and estimate >= 0:
+            logger.debug(f"Estimated tickers count: {estimate}")
+            return estimate
+    return await get_cached_tickers_count(db, search, start_date, end_date)
+
+def encode_order_cursor(timestamp: datetime, order_id: uuid.UUID) -> str:
+    """Opaque keyset cursor for the (timestamp, id) position of the last order on a page."""
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{order_id}".encode()).decode()
+
+def decode_order_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Inverse of encode_order_cursor; raises a 400 for anything it did not produce."""
+    try:
+        timestamp, order_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(timestamp), uuid.UUID(order_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        logger.error(f"Invalid orders cursor: {cursor}")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def count_orders(db: AsyncSession, orders_query) -> int:
+    """Count the rows an orders query matches."""
+    total = await db.execute(select(func.count()).select_from(orders_query.subquery()))
+    return total.scalar()
+
 async def get_orders_by_tick_id(
     db: AsyncSession,
     tick_id: uuid.UUID,
     skip: int = 0,
     limit: int = 100,
-    interval: Optional[int] = None
+    interval: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    columnar: bool = False
 ) -> Optional[dict]:
-    logger.info(f"Fetching orders for tick_id={tick_id}, skip={skip}, limit={limit}, interval={interval}")
-    tick = await db.execute(select(Ticks).where(Ticks.id == tick_id))
-    tick = tick.scalar_one_or_none()
-    if not tick:
-        logger.warning(f"No ticker found for tick_id={tick_id}")
-        return None
-
-    orders_query = select(Orders).where(Orders.tick_id == tick_id)
+    """
+    A page of a ticker's orders, newest first. With columnar=True the orders are returned as
+    {column: list} built straight from the result rows (see ORDER_COLUMN_TYPES), for binary responses.
+    """
+    logger.info(f"Fetching orders for tick_id={tick_id}, skip={skip}, limit={limit}, interval={interval}, cursor={cursor}")
+    if columnar:
+        orders_query = select(*(getattr(Orders, column) for column in ORDER_COLUMN_TYPES))
+    else:
+        orders_query = select(Orders)
+    orders_query = orders_query.where(Orders.tick_id == tick_id)
     if interval is not None:
         if interval < 0:
             logger.error("Interval must be a positive number")
@@ -158,27 +337,199 @@ async def get_orders_by_tick_id(
         time_threshold = current_time - timedelta(minutes=interval)
         orders_query = orders_query.where(Orders.timestamp >= time_threshold)
 
-    orders_query = orders_query.order_by(Orders.timestamp.desc())
-    total_orders = await db.execute(select(func.count()).select_from(orders_query))
-    total_orders = total_orders.scalar()
-    orders = await db.execute(orders_query.offset(skip).limit(limit))
-    orders = orders.scalars().all()
+    # A keyset page that starts before today only holds orders of closed days, so it is immutable.
+    # It is looked up before counting and keeps the total counted when it was cached, so a hit
+    # costs no query. Cached pages hold JSON-shaped orders, so columnar pages are read from the database.
+    cache_key = None
+    if cursor and interval is None and not columnar:
+        cursor_timestamp, _ = decode_order_cursor(cursor)
+        if cursor_timestamp.astimezone().date() < date.today():
+            page, cache_key = get_cached_orders_page(tick_id, cursor, limit)
+            if page is not None:
+                logger.info(f"Orders page cache hit for tick_id={tick_id}")
+                if include_total and page.get("total") is None:
+                    page["total"] = await count_orders(db, orders_query)
+                    cache_orders_page(cache_key, page)
+                return {
+                    "ticker": page["ticker"],
+                    "orders": [OrderResponse(**order) for order in page["orders"]],
+                    "total": page["total"] if include_total else None,
+                    "skip": skip,
+                    "limit": limit,
+                    "interval": interval,
+                    "next_cursor": page["next_cursor"]
+                }
+
+    total_orders = await count_orders(db, orders_query) if include_total else None
+
+    tick = await db.execute(select(Ticks).where(Ticks.id == tick_id))
+    tick = tick.scalar_one_or_none()
+    if not tick:
+        logger.warning(f"No ticker found for tick_id={tick_id}")
+        return None
+
+    # Newest first; id breaks ties between orders sharing a timestamp
+    orders_query = orders_query.order_by(Orders.timestamp.desc(), Orders.id.desc())
+    if cursor:
+        # Keyset page: seek past the cursor position on ix_orders_tick_id_timestamp instead of
+        # counting off skipped rows. The plain timestamp bound is what the index range scan uses.
+        cursor_timestamp, cursor_id = decode_order_cursor(cursor)
+        orders_query = orders_query.where(
+            Orders.timestamp <= cursor_timestamp,
+            or_(
+                Orders.timestamp < cursor_timestamp,
+                and_(Orders.timestamp == cursor_timestamp, Orders.id < cursor_id)
+            )
+        )
+    else:
+        orders_query = orders_query.offset(skip)
+    orders = await db.execute(orders_query.limit(limit))
+    orders = orders.all() if columnar else orders.scalars().all()
 
-    if not orders and total_orders == 0:
+    if not orders and not cursor and (total_orders == 0 or (total_orders is None and skip == 0)):
         logger.info(f"No orders found for tick_id={tick_id}")
         return None
 
+    logger.info(f"Retrieved {len(orders)} orders for tick_id={tick_id}")
+    # A full page may have more behind it; hand back where the next one starts
+    next_cursor = encode_order_cursor(orders[-1].timestamp, orders[-1].id) if len(orders) == limit else None
+    if columnar:
+        return {
+            "ticker": tick.ticker,
+            "orders": columns_from_rows(orders, list(ORDER_COLUMN_TYPES)),
+            "total": total_orders,
+            "skip": skip,
+            "limit": limit,
+            "interval": interval,
+            "next_cursor": next_cursor
+        }
+
     orders_list = [OrderResponse.from_orm(order) for order in orders]
-    logger.info(f"Retrieved {len(orders_list)} orders for tick_id={tick_id}")
+    if cache_key:
+        cache_orders_page(cache_key, {
+            "ticker": tick.ticker,
+            "orders": [order.model_dump(mode='json') for order in orders_list],
+            "total": total_orders,
+            "next_cursor": next_cursor
+        })
     return {
         "ticker": tick.ticker,
         "orders": orders_list,
         "total": total_orders,
         "skip": skip,
         "limit": limit,
-        "interval": interval
+        "interval": interval,
+        "next_cursor": next_cursor
     }
 
+async def get_downsampled_series(
+    db: AsyncSession,
+    tick_id: uuid.UUID,
+    points: int = 1000,
+    method: str = 'lttb',
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Optional[SeriesResponse]:
+    """
+    The ticker's ltp series reduced to about `points` points (LTTB or min/max per bucket).
+    Orders are streamed through a server-side cursor in SERIES_CHUNK_SIZE partitions and folded into
+    the downsampler as they arrive, so memory stays bounded however long the history is.
+    """
+    logger.info(f"Fetching {method} series for tick_id={tick_id}, points={points}, start_date={start_date}, end_date={end_date}")
+    if start_date and end_date and end_date < start_date:
+        logger.error("end_date cannot be less than start_date")
+        raise HTTPException(status_code=400, detail="end_date cannot be less than start_date")
+
+    tick = await db.execute(select(Ticks).where(Ticks.id == tick_id))
+    tick = tick.scalar_one_or_none()
+    if not tick:
+        logger.warning(f"No ticker found for tick_id={tick_id}")
+        return None
+
+    timestamp_filters = [Orders.tick_id == tick_id]
+    if start_date:
+        timestamp_filters.append(Orders.timestamp >= start_date)
+    if end_date:
+        timestamp_filters.append(Orders.timestamp < end_date + timedelta(days=1))
+
+    # The row count fixes the bucket sizes; it is an index range count on ix_orders_tick_id_timestamp
+    total = await db.execute(select(func.count()).select_from(Orders).where(*timestamp_filters))
+    total = total.scalar()
+    if not total:
+        return SeriesResponse(ticker=tick.ticker, method=method, source_points=0, points=[])
+
+    downsampler = StreamingDownsampler(total, points, method)
+    source_points = 0
+    result = await db.stream(
+        select(Orders.timestamp, Orders.ltp)
+        .where(*timestamp_filters)
+        .order_by(Orders.timestamp)
+        .execution_options(yield_per=SERIES_CHUNK_SIZE)
+    )
+    async for partition in result.partitions():
+        source_points += len(partition)
+        downsampler.feed(
+            np.fromiter((row[0].timestamp() for row in partition), dtype=np.float64, count=len(partition)),
+            np.fromiter((row[1] for row in partition), dtype=np.float64, count=len(partition))
+        )
+
+    timestamps, values = downsampler.finish()
+    logger.info(f"Reduced {source_points} orders to {len(timestamps)} points for tick_id={tick_id}")
+    return SeriesResponse(
+        ticker=tick.ticker,
+        method=method,
+        source_points=source_points,
+        points=[
+            SeriesPoint(timestamp=datetime.fromtimestamp(timestamp, tz=timezone.utc), ltp=value)
+            for timestamp, value in zip(timestamps, values)
+        ]
+    )
+
+async def get_ticker_symbol(db: AsyncSession, tick_id: uuid.UUID) -> Optional[str]:
+    """Return the ticker symbol of a tick id, or None if it does not exist."""
+    return await db.scalar(select(Ticks.ticker).where(Ticks.id == tick_id))
+
+async def stream_orders_export(
+    tick_id: uuid.UUID,
+    export_format: str = 'ndjson',
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """
+    Yield a ticker's orders, oldest first, as NDJSON lines or CSV rows. Rows come from a server-side
+    cursor EXPORT_CHUNK_SIZE at a time and each partition is sent as one chunk, so memory stays flat
+    however many rows are exported. Uses its own read session, like stream_ohlc_batch.
+    """
+    from app.db.session import read_session
+
+    logger.info(f"Streaming {export_format} export for tick_id={tick_id}, start_date={start_date}, end_date={end_date}")
+    query = select(*(getattr(Orders, column) for column in EXPORT_COLUMNS)).where(Orders.tick_id == tick_id)
+    if start_date:
+        query = query.where(Orders.timestamp >= start_date)
+    if end_date:
+        query = query.where(Orders.timestamp < end_date + timedelta(days=1))
+    query = query.order_by(Orders.timestamp, Orders.id).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+
+    if export_format == 'csv':
+        yield (",".join(EXPORT_COLUMNS) + "\n").encode()
+
+    exported = 0
+    async with read_session() as session:
+        result = await session.stream(query)
+        async for partition in result.partitions():
+            exported += len(partition)
+            if export_format == 'csv':
+                buffer = io.StringIO()
+                writer = csv.writer(buffer, lineterminator="\n")
+                writer.writerows((row[0].isoformat(), *row[1:]) for row in partition)
+                yield buffer.getvalue().encode()
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(EXPORT_COLUMNS, (row[0].isoformat(), *row[1:])))) + "\n"
+                    for row in partition
+                ).encode()
+    logger.info(f"Exported {exported} orders for tick_id={tick_id}")
+
 async def update_tickers(db: AsyncSession):
     logger.info("Updating tickers via WebSocket")
     tickers, total, skip, limit = await get_tickers(db)
@@ -190,93 +541,303 @@ async def update_tickers(db: AsyncSession):
     })
     logger.info("Tickers updated and broadcasted via WebSocket")
 
-async def get_ohlc_data(
-    db: AsyncSession,
-    ticker: str,
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None
-) -> List[OHLCResponse]:
+def ohlc_query(ticker: str, start_date: Optional[date] = None, end_date: Optional[date] = None, resolution: str = '1d'):
     """
-    Aggregate second-level tick data into daily OHLC (Open-High-Low-Close) format.
+    OHLC candles for one ticker in a single pass over its orders: high/low are plain aggregates and
+    open/close the first and last ltp of each bucket by timestamp, via ordered aggregates.
+    Buckets are calendar days for 1d, otherwise date_bin() intervals aligned to local midnight.
     """
-    logger.info(f"Fetching OHLC data for ticker={ticker}, start_date={start_date}, end_date={end_date}")
+    # Resolve the ticker once so the scan is an index range on (tick_id, timestamp)
+    tick_id = select(Ticks.id).where(Ticks.ticker == ticker).scalar_subquery()
 
-    # Subquery for daily low/high
-    high_low_subquery = (
+    # Filter on the raw timestamp so the date range reaches the scan and prunes orders partitions
+    timestamp_filters = []
+    if start_date:
+        timestamp_filters.append(Orders.timestamp >= start_date)
+    if end_date:
+        timestamp_filters.append(Orders.timestamp < end_date + timedelta(days=1))
+
+    if resolution == '1d':
+        bucket = day = func.date(Orders.timestamp)
+    else:
+        origin = literal('2000-01-01').cast(DateTime(timezone=True))
+        bucket = func.date_bin(OHLC_RESOLUTIONS[resolution], Orders.timestamp, origin)
+        day = func.date(bucket)
+
+    return (
         select(
-            func.date(Orders.timestamp).label("date"),
+            bucket.label("bucket"),
+            day.label("day"),
+            array_agg(aggregate_order_by(Orders.ltp, Orders.timestamp.asc()))[1].label("open"),
+            func.max(Orders.ltp).label("high"),
             func.min(Orders.ltp).label("low"),
-            func.max(Orders.ltp).label("high")
+            array_agg(aggregate_order_by(Orders.ltp, Orders.timestamp.desc()))[1].label("close")
         )
-        .join(Ticks, Ticks.id == Orders.tick_id)
-        .where(Ticks.ticker == ticker)
-        .group_by(func.date(Orders.timestamp))
-        .subquery()
+        .where(Orders.tick_id == tick_id, *timestamp_filters)
+        .group_by(bucket)
+        .order_by(bucket)
     )
 
-    # Subquery for daily open price (first price of the day)
-    open_subquery = (
-        select(
-            func.date(Orders.timestamp).label("date"),
-            Orders.ltp.label("open")
+async def get_daily_ohlc(db: AsyncSession, ticker: str, start_date: Optional[date], end_date: Optional[date]) -> List[dict]:
+    """Daily candles: closed days come from the ohlc_daily rollup, the current day from raw orders."""
+    today = date.today()
+    rollup_query = (
+        select(OhlcDaily.date, OhlcDaily.open, OhlcDaily.high, OhlcDaily.low, OhlcDaily.close)
+        .where(
+            OhlcDaily.tick_id == select(Ticks.id).where(Ticks.ticker == ticker).scalar_subquery(),
+            OhlcDaily.date < today
         )
-        .join(Ticks, Ticks.id == Orders.tick_id)
-        .where(Ticks.ticker == ticker)
-        .distinct(func.date(Orders.timestamp))
-        .order_by(func.date(Orders.timestamp), Orders.timestamp.asc())
-        .subquery()
+        .order_by(OhlcDaily.date)
     )
+    if start_date:
+        rollup_query = rollup_query.where(OhlcDaily.date >= start_date)
+    if end_date:
+        rollup_query = rollup_query.where(OhlcDaily.date <= end_date)
 
-    # Subquery for daily close price (last price of the day)
-    close_subquery = (
-        select(
-            func.date(Orders.timestamp).label("date"),
-            Orders.ltp.label("close")
+    result = await db.execute(rollup_query)
+    rows = result.all()
+
+    # Only the current, still-open day is aggregated from raw orders
+    if (not start_date or start_date <= today) and (not end_date or end_date >= today):
+        result = await db.execute(ohlc_query(ticker, today, today))
+        rows += [(row.day, row.open, row.high, row.low, row.close) for row in result.all()]
+
+    return [
+        {"ticker": ticker, "date": day, "timestamp": None, "open": open_, "high": high, "low": low, "close": close}
+        for day, open_, high, low, close in rows
+    ]
+
+async def resolve_intraday_range(
+    db: AsyncSession,
+    ticker: str,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    resolution: str
+) -> Tuple[date, date]:
+    """
+    Fill in the date range of an intraday request and enforce the span limit of its resolution.
+    Without dates the ticker's latest trading day is charted.
+    """
+    if not start_date:
+        if not end_date:
+            latest = await db.execute(
+                select(Orders.timestamp)
+                .join(Ticks, latest_order_condition())
+                .where(Ticks.ticker == ticker)
+            )
+            latest = latest.scalar_one_or_none()
+            end_date = latest.date() if latest else date.today()
+        start_date = end_date
+    end_date = end_date or date.today()
+
+    if (end_date - start_date).days + 1 > OHLC_MAX_INTRADAY_DAYS[resolution]:
+        logger.error(f"Date range too long for resolution={resolution}")
+        raise HTTPException(
+            status_code=400,
+            detail=f"{resolution} candles are limited to {OHLC_MAX_INTRADAY_DAYS[resolution]} days per request"
         )
-        .join(Ticks, Ticks.id == Orders.tick_id)
-        .where(Ticks.ticker == ticker)
-        .distinct(func.date(Orders.timestamp))
-        .order_by(func.date(Orders.timestamp), Orders.timestamp.desc())
-        .subquery()
-    )
+    return start_date, end_date
+
+async def get_intraday_ohlc(
+    db: AsyncSession,
+    ticker: str,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    resolution: str
+) -> List[dict]:
+    """Intraday candles bucketed from raw orders in one indexed range scan."""
+    result = await db.execute(ohlc_query(ticker, start_date, end_date, resolution))
+    return [
+        {
+            "ticker": ticker,
+            "date": row.day,
+            "timestamp": row.bucket,
+            "open": row.open,
+            "high": row.high,
+            "low": row.low,
+            "close": row.close
+        }
+        for row in result.all()
+    ]
+
+async def get_cached_ohlc(
+    db: AsyncSession,
+    ticker: str,
+    start_date: date,
+    end_date: date,
+    resolution: str
+) -> List[dict]:
+    """
+    Read-through cache: assemble a date range from per-day candle blocks in Redis and query the
+    database once for the span of days that are missing. Days after today are never cached.
+    """
+    days = days_between(start_date, min(end_date, date.today()))
+    blocks = get_cached_ohlc_days(ticker, resolution, days)
+    missing = [day for day in days if day not in blocks]
+
+    if missing:
+        logger.info(f"OHLC cache miss for ticker={ticker}, resolution={resolution}: {len(missing)} of {len(days)} days")
+        if resolution == '1d':
+            candles = await get_daily_ohlc(db, ticker, missing[0], missing[-1])
+        else:
+            candles = await get_intraday_ohlc(db, ticker, missing[0], missing[-1], resolution)
+
+        # Record empty days too, so weekends and holidays are not re-queried on every request
+        fetched = {day: [] for day in days_between(missing[0], missing[-1])}
+        for candle in candles:
+            fetched[candle["date"]].append(candle)
+        cache_ohlc_days(ticker, resolution, fetched)
+        blocks.update(fetched)
+
+    return [candle for day in days for candle in blocks[day]]
+
+async def get_ohlc_data(
+    db: AsyncSession,
+    ticker: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    resolution: str = '1d'
+) -> List[dict]:
+    """
+    OHLC (Open-High-Low-Close) candles for a ticker at the given resolution (1m, 5m, 15m, 1h or 1d),
+    as plain dicts shaped like OHLCResponse so binary responses can be built without per-row models.
+    """
+    logger.info(f"Fetching OHLC data for ticker={ticker}, start_date={start_date}, end_date={end_date}, resolution={resolution}")
+    if resolution not in OHLC_RESOLUTIONS:
+        logger.error(f"Invalid resolution: {resolution}")
+        raise HTTPException(status_code=400, detail=f"resolution must be one of: {', '.join(OHLC_RESOLUTIONS)}")
+    if start_date and end_date and end_date < start_date:
+        logger.error("end_date cannot be less than start_date")
+        raise HTTPException(status_code=400, detail="end_date cannot be less than start_date")
+
+    if resolution != '1d':
+        start_date, end_date = await resolve_intraday_range(db, ticker, start_date, end_date, resolution)
 
-    # Main query joining all subqueries
-    query = (
+    # Bounded ranges go through the per-day cache; open-ended daily history is read from the rollup
+    if start_date:
+        results = await get_cached_ohlc(db, ticker, start_date, end_date or date.today(), resolution)
+    else:
+        results = await get_daily_ohlc(db, ticker, start_date, end_date)
+
+    if not results:
+        logger.warning(f"No OHLC data found for ticker={ticker}")
+        raise HTTPException(status_code=404, detail="No OHLC data found for the given ticker and date range")
+
+    logger.info(f"Retrieved {len(results)} OHLC records for ticker={ticker}")
+    return results
+
+def batch_ohlc_query(tickers: List[str], start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """
+    Daily candles for many tickers in one statement ordered by (ticker, date): closed days from the
+    ohlc_daily rollup, UNION ALL the current day grouped by (ticker, day) from raw orders.
+    """
+    today = date.today()
+
+    rollup_query = (
         select(
-            high_low_subquery.c.date,
-            open_subquery.c.open,
-            high_low_subquery.c.high,
-            high_low_subquery.c.low,
-            close_subquery.c.close
+            Ticks.ticker.label("ticker"),
+            OhlcDaily.date.label("date"),
+            OhlcDaily.open.label("open"),
+            OhlcDaily.high.label("high"),
+            OhlcDaily.low.label("low"),
+            OhlcDaily.close.label("close")
         )
-        .join(open_subquery, high_low_subquery.c.date == open_subquery.c.date)
-        .join(close_subquery, high_low_subquery.c.date == close_subquery.c.date)
+        .join(Ticks, Ticks.id == OhlcDaily.tick_id)
+        .where(Ticks.ticker.in_(tickers), OhlcDaily.date < today)
     )
-
     if start_date:
-        query = query.where(high_low_subquery.c.date >= start_date)
+        rollup_query = rollup_query.where(OhlcDaily.date >= start_date)
     if end_date:
-        query = query.where(high_low_subquery.c.date <= end_date)
+        rollup_query = rollup_query.where(OhlcDaily.date <= end_date)
+    queries = [rollup_query]
 
-    result = await db.execute(query)
-    ohlc_data = result.all()
+    # Only the current, still-open day is aggregated from raw orders
+    if (not start_date or start_date <= today) and (not end_date or end_date >= today):
+        day = func.date(Orders.timestamp)
+        queries.append(
+            select(
+                Ticks.ticker,
+                day,
+                array_agg(aggregate_order_by(Orders.ltp, Orders.timestamp.asc()))[1],
+                func.max(Orders.ltp),
+                func.min(Orders.ltp),
+                array_agg(aggregate_order_by(Orders.ltp, Orders.timestamp.desc()))[1]
+            )
+            .join(Ticks, Ticks.id == Orders.tick_id)
+            .where(
+                Ticks.ticker.in_(tickers),
+                Orders.timestamp >= today,
+                Orders.timestamp < today + timedelta(days=1)
+            )
+            .group_by(Ticks.ticker, day)
+        )
 
-    if not ohlc_data:
-        logger.warning(f"No OHLC data found for ticker={ticker}")
-        raise HTTPException(status_code=404, detail="No OHLC data found for the given ticker and date range")
+    return union_all(*queries).order_by(literal_column("ticker"), literal_column("date"))
 
-    # Convert results to OHLCResponse objects
-    results = [
-        OHLCResponse(
-            ticker=ticker,
-            date=row.date,
-            open=row.open,
-            high=row.high,
-            low=row.low,
-            close=row.close
+async def stream_ohlc_batch(
+    tickers: List[str],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    binary_format: Optional[str] = None
+):
+    """
+    Yield a JSON object mapping each requested ticker to its daily candles, one ticker at a time,
+    as rows arrive from a server-side cursor. Tickers without data map to an empty list.
+    With binary_format='arrow' an Arrow IPC stream is sent instead (one record batch per ticker with
+    data), and with 'msgpack' a MessagePack map of ticker to candle columns.
+    Uses its own read session because the response body is produced after the request dependencies exit.
+    """
+    from app.db.session import read_session
+
+    logger.info(f"Streaming batch OHLC for {len(tickers)} tickers, start_date={start_date}, end_date={end_date}")
+    candle_columns = ['date', 'open', 'high', 'low', 'close']
+    if binary_format == 'arrow':
+        encoder = ArrowStreamEncoder({column: OHLC_COLUMN_TYPES[column] for column in ['ticker', *candle_columns]})
+    elif binary_format == 'msgpack':
+        packer = msgpack_packer()
+
+    def encode_ticker(ticker, rows) -> bytes:
+        if binary_format == 'arrow':
+            return encoder.write({'ticker': [ticker] * len(rows), **columns_from_rows(rows, candle_columns)})
+        if binary_format == 'msgpack':
+            return packer.pack(ticker) + packer.pack(columns_from_rows(rows, candle_columns))
+        candles = ",".join(
+            json.dumps({"date": day.isoformat(), "open": open_, "high": high, "low": low, "close": close})
+            for day, open_, high, low, close in rows
         )
-        for row in ohlc_data
-    ]
+        return f"{json.dumps(ticker)}:[{candles}]".encode()
 
-    logger.info(f"Retrieved {len(results)} OHLC records for ticker={ticker}")
-    return results
\ No newline at end of file
+    # JSON wraps the tickers in braces; a MessagePack map announces its size up front
+    if binary_format == 'msgpack':
+        prefix, separator = packer.pack_map_header(len(tickers)), b""
+    elif binary_format == 'arrow':
+        prefix, separator = b"", b""
+    else:
+        prefix, separator = b"{", b","
+
+    pending = dict.fromkeys(tickers)
+    current, rows = None, []
+    async with read_session() as session:
+        result = await session.stream(batch_ohlc_query(tickers, start_date, end_date))
+        async for ticker, day, open_, high, low, close in result:
+            # Rows arrive grouped by ticker; send each ticker's candles as one chunk
+            if ticker != current and current is not None:
+                yield prefix + encode_ticker(current, rows)
+                prefix, rows = separator, []
+            current = ticker
+            pending.pop(ticker, None)
+            rows.append((day, open_, high, low, close))
+
+    if current is not None:
+        yield prefix + encode_ticker(current, rows)
+        prefix = separator
+    if binary_format == 'arrow':
+        # Arrow streams only carry rows, so tickers without data are simply absent
+        yield prefix + encoder.close()
+    else:
+        for ticker in pending:
+            yield prefix + encode_ticker(ticker, [])
+            prefix = separator
+        if binary_format is None:
+            yield b"{}" if prefix == b"{" else b"}"
+    logger.info(f"Streamed batch OHLC for {len(tickers) - len(pending)} tickers with data")
@@ -6,6 +6,7 @@ from passlib.context import CryptContext
 from fastapi import HTTPException
 from app.middleware.jwt import JWTHandler
 from app.middleware.logger import get_logger
+from app.utils.primary_pins import pin_to_primary
 
 # Initialize logger for tracking user-related operations
 logger = get_logger()
@@ -35,6 +36,8 @@ async def create_user(db: AsyncSession, user: UserCreate) -> UserResponse:
     await db.refresh(db_user)
 
     logger.info(f"User created with id={db_user.id}")
+    # Reads right after signup (e.g. token checks) must find the new user on the primary
+    pin_to_primary(db_user.id)
     return UserResponse.from_orm(db_user)
 
 async def authenticate_user(db: AsyncSession, user: UserLogin) -> Users:
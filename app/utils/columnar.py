@@ -0,0 +1,156 @@
+import io
+import json
+from typing import Optional
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow responses are only offered when pyarrow is installed
+    pa = None
+
+try:
+    import msgpack
+except ImportError:  # MessagePack responses are only offered when msgpack is installed
+    msgpack = None
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Accept values understood for each binary format
+BINARY_MEDIA_TYPES = {
+    'arrow': (ARROW_MEDIA_TYPE,),
+    'msgpack': (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"),
+}
+
+RESPONSE_MEDIA_TYPES = {'arrow': ARROW_MEDIA_TYPE, 'msgpack': MSGPACK_MEDIA_TYPE}
+
+# Column types of the columnar market data payloads
+ORDER_COLUMN_TYPES = {
+    'id': 'uuid',
+    'timestamp': 'timestamp',
+    'ltp': 'float',
+    'buyprice': 'float',
+    'buyqty': 'int',
+    'sellprice': 'float',
+    'sellqty': 'int',
+    'ltq': 'int',
+    'openinterest': 'int',
+}
+
+OHLC_COLUMN_TYPES = {
+    'ticker': 'str',
+    'date': 'date',
+    'timestamp': 'timestamp',
+    'open': 'float',
+    'high': 'float',
+    'low': 'float',
+    'close': 'float',
+}
+
+def arrow_type(column_type: str):
+    return {
+        'uuid': pa.string(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+        'date': pa.date32(),
+        'float': pa.float64(),
+        'int': pa.int64(),
+        'str': pa.string(),
+    }[column_type]
+
+def installed_formats():
+    """Binary formats whose encoder is importable."""
+    return [name for name, module in (('arrow', pa), ('msgpack', msgpack)) if module is not None]
+
+def negotiate_binary_format(accept: Optional[str]) -> Optional[str]:
+    """
+    Pick 'arrow' or 'msgpack' when the Accept header names one (and it is installed) with a quality
+    at least that of JSON; otherwise None, meaning JSON. Wildcards only ever select JSON.
+    """
+    if not accept:
+        return None
+    json_quality, best, best_quality = 0.0, None, 0.0
+    for media_range in accept.split(","):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        media_type = media_type.lower()
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type in ("application/json", "application/*", "*/*"):
+            json_quality = max(json_quality, quality)
+            continue
+        for name in installed_formats():
+            # Ties between binary formats go to the one listed first
+            if media_type in BINARY_MEDIA_TYPES[name] and quality > best_quality:
+                best, best_quality = name, quality
+    return best if best and best_quality >= json_quality else None
+
+def columns_from_rows(rows, names):
+    """Transpose result rows (tuples in `names` order) into {name: list of values}."""
+    values = list(zip(*rows)) if rows else [()] * len(names)
+    return {name: list(column) for name, column in zip(names, values)}
+
+def arrow_schema(column_types, metadata: Optional[dict] = None):
+    """Arrow schema for the given column types; metadata values are stored JSON-encoded."""
+    return pa.schema(
+        [(name, arrow_type(column_type)) for name, column_type in column_types.items()],
+        metadata={key: json.dumps(value) for key, value in (metadata or {}).items()}
+    )
+
+def arrow_batch(columns, column_types, schema):
+    """Build a RecordBatch straight from column lists; UUIDs are sent as their string form."""
+    arrays = []
+    for name, column_type in column_types.items():
+        values = columns[name]
+        if column_type == 'uuid':
+            values = [str(value) for value in values]
+        arrays.append(pa.array(values, type=arrow_type(column_type)))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def encode_columns(binary_format: str, columns, column_types, metadata: Optional[dict] = None) -> bytes:
+    """
+    Encode {name: list} columns as one Arrow IPC stream (metadata in the schema) or as a MessagePack
+    map of the metadata plus a `columns` map. Datetimes become MessagePack timestamps.
+    """
+    if binary_format == 'arrow':
+        schema = arrow_schema(column_types, metadata)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            writer.write_batch(arrow_batch(columns, column_types, schema))
+        return sink.getvalue().to_pybytes()
+
+    payload = dict(metadata or {})
+    payload['columns'] = {name: columns[name] for name in column_types}
+    return msgpack_packer().pack(payload)
+
+def msgpack_packer():
+    """Packer for market data: aware datetimes as MessagePack timestamps, UUIDs and dates as strings."""
+    return msgpack.Packer(datetime=True, default=str)
+
+class ArrowStreamEncoder:
+    """
+    Incremental Arrow IPC stream for streamed responses: the schema goes out with the first chunk,
+    then each write() returns the bytes of one record batch, and close() the end-of-stream marker.
+    """
+    def __init__(self, column_types, metadata: Optional[dict] = None):
+        self.column_types = column_types
+        self.schema = arrow_schema(column_types, metadata)
+        self.buffer = io.BytesIO()
+        self.writer = pa.ipc.new_stream(self.buffer, self.schema)
+
+    def drain(self) -> bytes:
+        chunk = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return chunk
+
+    def write(self, columns) -> bytes:
+        self.writer.write_batch(arrow_batch(columns, self.column_types, self.schema))
+        return self.drain()
+
+    def close(self) -> bytes:
+        self.writer.close()
+        return self.drain()
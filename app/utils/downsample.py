@@ -0,0 +1,167 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for series downsampling
+    np = None
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+# Most LTTB candidates buffered for one bucket before they are reduced to their convex hull
+LTTB_MAX_CANDIDATES = 4096
+
+def convex_hull_indexes(t, v):
+    """
+    Indexes (ascending) of the points on the convex hull of (t, v), by Andrew's monotone chain.
+    The triangle area LTTB maximises is the absolute value of a linear function of the candidate
+    point, so the largest one is always found on the hull.
+    """
+    # Points strictly inside the quadrilateral of the extreme points are never on the hull (Akl-Toussaint)
+    corners = [int(np.argmin(t)), int(np.argmin(v)), int(np.argmax(t)), int(np.argmax(v))]
+    inside = np.ones(len(t), dtype=bool)
+    for a, b in zip(corners, corners[1:] + corners[:1]):
+        inside &= (t[b] - t[a]) * (v - v[a]) - (v[b] - v[a]) * (t - t[a]) > 0
+    candidates = np.flatnonzero(~inside)
+
+    order = candidates[np.lexsort((v[candidates], t[candidates]))].tolist()
+    ts, vs = t.tolist(), v.tolist()
+    lower, upper = [], []
+    for chain, sign in ((lower, 1), (upper, -1)):
+        for i in order:
+            while len(chain) >= 2:
+                a, b = chain[-2], chain[-1]
+                if sign * ((ts[b] - ts[a]) * (vs[i] - vs[a]) - (vs[b] - vs[a]) * (ts[i] - ts[a])) > 0:
+                    break
+                chain.pop()
+            chain.append(i)
+    return np.unique(np.array(lower + upper, dtype=np.int64))
+
+class StreamingDownsampler:
+    """
+    Reduce a time-ordered (t, value) series of `total` rows to about `points` representative points
+    while it streams in. Buckets hold equal numbers of rows, so gaps such as nights and weekends do
+    not leave buckets empty.
+
+    - lttb: Largest-Triangle-Three-Buckets with the canonical bucket edges: the first and last rows
+      are kept on their own, and row i of the rows in between falls in the bucket b with
+      floor(b * every) <= i < floor((b + 1) * every), every = (total - 2) / (points - 2). Each bucket
+      keeps the point forming the largest triangle with the previously kept point and the next
+      bucket's mean (the last point, for the final bucket). Only the buckets being compared are held,
+      as running sums plus at most LTTB_MAX_CANDIDATES candidate points each.
+    - minmax: each bucket keeps its minimum and maximum, in time order, as a running min and max.
+    """
+    def __init__(self, total: int, points: int, method: str = 'lttb'):
+        if np is None:
+            raise RuntimeError("NumPy is required for series downsampling")
+        self.method = method
+        self.buckets = max(points - 2, 1) if method == 'lttb' else max(points // 2, 1)
+        # LTTB keeps the first and last rows on their own and buckets the ones in between
+        self.span = max(total - 2 if method == 'lttb' else total, 1)
+        self.position = 0
+        self.selected_t, self.selected_v = [], []
+        self.first = None
+        self.held = None           # Most recent row (lttb): it is only bucketed once a later row arrives
+        self.pending = None        # Completed bucket waiting for the next one's mean (lttb)
+        self.current = None        # Bucket being filled
+        self.current_index = None
+
+    def bucket_indexes(self, positions):
+        """Canonical bucket of each row position, computed exactly with integers."""
+        indexes = ((positions + 1) * self.buckets + self.span - 1) // self.span - 1
+        # Rows beyond the expected total (inserted after it was counted) join the last bucket
+        return np.minimum(indexes, self.buckets - 1)
+
+    def feed(self, t, v):
+        """Add the next chunk of timestamps (epoch seconds) and values, both NumPy arrays ordered by t."""
+        if not len(t):
+            return
+        if self.method == 'lttb':
+            if self.first is None:
+                self.first = (t[0], v[0])
+                self.selected_t.append(t[0])
+                self.selected_v.append(v[0])
+                t, v = t[1:], v[1:]
+                if not len(t):
+                    return
+            # Hold back the newest row: the last row of the series is never part of a bucket
+            if self.held is not None:
+                t, v = np.concatenate(([self.held[0]], t)), np.concatenate(([self.held[1]], v))
+            self.held = (t[-1], v[-1])
+            t, v = t[:-1], v[:-1]
+            if not len(t):
+                return
+
+        indexes = self.bucket_indexes(np.arange(self.position, self.position + len(t), dtype=np.int64))
+        # Split the chunk where the bucket index changes; indexes never decrease
+        boundaries = np.flatnonzero(np.diff(indexes)) + 1
+        for start, end in zip(np.concatenate(([0], boundaries)), np.concatenate((boundaries, [len(t)]))):
+            if indexes[start] != self.current_index:
+                self.close_bucket()
+                self.current_index = indexes[start]
+            if self.method == 'minmax':
+                self.add_min_max(t[start:end], v[start:end], self.position + start)
+            else:
+                self.add_candidates(t[start:end], v[start:end])
+        self.position += len(t)
+
+    def add_min_max(self, t, v, offset):
+        """Fold a segment into the bucket's running minimum and maximum as (position, t, v)."""
+        low, high = int(np.argmin(v)), int(np.argmax(v))
+        low, high = (offset + low, t[low], v[low]), (offset + high, t[high], v[high])
+        if self.current is None:
+            self.current = [low, high]
+            return
+        # Strict comparisons keep the earliest row among equal values, like argmin/argmax over the bucket
+        if low[2] < self.current[0][2]:
+            self.current[0] = low
+        if high[2] > self.current[1][2]:
+            self.current[1] = high
+
+    def add_candidates(self, t, v):
+        """Add a segment to the bucket's sums and candidates, reducing the candidates when they overflow."""
+        if self.current is None:
+            self.current = {'t': t, 'v': v, 'sum_t': t.sum(), 'sum_v': v.sum(), 'count': len(t)}
+            return
+        bucket = self.current
+        bucket['sum_t'] += t.sum()
+        bucket['sum_v'] += v.sum()
+        bucket['count'] += len(t)
+        bucket['t'] = np.concatenate((bucket['t'], t))
+        bucket['v'] = np.concatenate((bucket['v'], v))
+        if len(bucket['t']) > LTTB_MAX_CANDIDATES:
+            keep = convex_hull_indexes(bucket['t'], bucket['v'])
+            if len(keep) > LTTB_MAX_CANDIDATES:
+                # Only long convex runs get here; thin the hull evenly to stay bounded
+                keep = keep[np.linspace(0, len(keep) - 1, LTTB_MAX_CANDIDATES).round().astype(np.int64)]
+            bucket['t'], bucket['v'] = bucket['t'][keep], bucket['v'][keep]
+
+    def close_bucket(self):
+        if self.current is None:
+            return
+        bucket, self.current = self.current, None
+        if self.method == 'minmax':
+            for _, t, v in sorted({point[0]: point for point in bucket}.values(), key=lambda point: point[0]):
+                self.selected_t.append(t)
+                self.selected_v.append(v)
+            return
+        if self.pending is not None:
+            self.keep_largest_triangle(self.pending, bucket['sum_t'] / bucket['count'], bucket['sum_v'] / bucket['count'])
+        self.pending = bucket
+
+    def keep_largest_triangle(self, bucket, next_t, next_v):
+        t, v = bucket['t'], bucket['v']
+        prev_t, prev_v = self.selected_t[-1], self.selected_v[-1]
+        areas = np.abs((prev_t - next_t) * (v - prev_v) - (prev_t - t) * (next_v - prev_v))
+        i = int(np.argmax(areas))
+        self.selected_t.append(t[i])
+        self.selected_v.append(v[i])
+
+    def finish(self):
+        """Flush the remaining buckets; returns (timestamps, values) lists of the kept points."""
+        self.close_bucket()
+        if self.method == 'lttb':
+            # The final bucket is compared against the last point, which is always kept
+            if self.pending is not None:
+                self.keep_largest_triangle(self.pending, *self.held)
+            if self.held is not None:
+                self.selected_t.append(self.held[0])
+                self.selected_v.append(self.held[1])
+        return [float(t) for t in self.selected_t], [float(v) for v in self.selected_v]
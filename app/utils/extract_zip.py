@@ -1,5 +1,69 @@
 import zipfile
 import os
+from contextlib import contextmanager, ExitStack
+
+# Separator between an archive path and the member path inside it, e.g. ticks.zip!2022/04.zip!NIFTY.csv
+ZIP_MEMBER_SEPARATOR = '!'
+
+def is_zip_member(source):
+    """Return True if the source refers to a member inside a zip archive."""
+    return ZIP_MEMBER_SEPARATOR in source
+
+def list_zip_csv_members(zip_path, zip_file=None):
+    """
+    Recursively list the CSV members of a zip archive, including CSVs inside nested zips,
+    without extracting anything to disk. Each member is returned as a (source, size) pair:
+    a source string that open_csv_source() can open from any process, and its uncompressed
+    size from the archive directory, so nothing has to be reopened to size it later.
+    """
+    sources = []
+    try:
+        with zipfile.ZipFile(zip_file or zip_path, 'r') as zip_ref:
+            for member in zip_ref.infolist():
+                if member.is_dir():
+                    continue
+                source = f"{zip_path}{ZIP_MEMBER_SEPARATOR}{member.filename}"
+                if member.filename.endswith('.zip'):
+                    with zip_ref.open(member) as nested_zip:
+                        sources.extend(list_zip_csv_members(source, nested_zip))
+                elif member.filename.endswith('.csv'):
+                    sources.append((source, member.file_size))
+    except zipfile.BadZipFile:
+        print(f"Error: {zip_path} is not a valid zip file.")
+    return sources
+
+def source_mtime(source):
+    """
+    Return the modification time of a plain CSV path, or of the archive on disk for a zip member,
+    so a rewritten archive marks all of its members as changed.
+    """
+    return os.path.getmtime(source.split(ZIP_MEMBER_SEPARATOR, 1)[0])
+
+def open_member_archive(stack, source):
+    """
+    Open the innermost archive that contains a zip member source, registering every
+    archive and nested stream on the ExitStack. Returns (zip_ref, member_name).
+    """
+    zip_path, *members = source.split(ZIP_MEMBER_SEPARATOR)
+    zip_ref = stack.enter_context(zipfile.ZipFile(zip_path, 'r'))
+    for nested_zip in members[:-1]:
+        zip_ref = stack.enter_context(zipfile.ZipFile(stack.enter_context(zip_ref.open(nested_zip)), 'r'))
+    return zip_ref, members[-1]
+
+@contextmanager
+def open_csv_source(source):
+    """
+    Open a plain CSV path or a (possibly nested) zip member as a binary stream.
+    Nested archives are read through ZipFile.open streams, so nothing is written to disk.
+    """
+    if not is_zip_member(source):
+        with open(source, 'rb') as f:
+            yield f
+        return
+
+    with ExitStack() as stack:
+        zip_ref, member = open_member_archive(stack, source)
+        yield stack.enter_context(zip_ref.open(member))
 
 def extract_zip_files(zip_path, extract_to, csv_list_file):
     """
@@ -30,7 +94,7 @@ def extract_zip_files(zip_path, extract_to, csv_list_file):
         # Append extracted CSV file paths to a text file
         with open(csv_list_file, 'a') as f:
             for csv_file in csv_files:
-                f.write(csv_file + '/n')
+                f.write(csv_file + '\n')
 
     except zipfile.BadZipFile:
         print(f"Error: {zip_path} is not a valid zip file.")
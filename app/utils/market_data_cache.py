@@ -0,0 +1,143 @@
+import os
+import json
+from typing import Optional
+from datetime import date, datetime, timedelta
+from redis import RedisError
+from app.config.redis_client_connection import redis_client
+from app.middleware.logger import get_logger
+
+logger = get_logger()
+
+# Closed trading days never change; they stay cached until the loader backfills them
+MARKET_CACHE_TTL_CLOSED = int(os.getenv("MARKET_CACHE_TTL_CLOSED", 7 * 24 * 3600))
+
+# The open day keeps moving, so it is only reused briefly (and dropped when an order is placed)
+MARKET_CACHE_TTL_OPEN = int(os.getenv("MARKET_CACHE_TTL_OPEN", 5))
+
+# Resolutions whose per-day blocks are invalidated together
+CACHED_RESOLUTIONS = ('1m', '5m', '15m', '1h', '1d')
+
+def day_ttl(day: date, empty: bool = False):
+    """
+    TTL for a cached day block, or None if the day has not started and must not be cached.
+    Empty closed days only get the open-day TTL: they may be a day whose data is not loaded yet.
+    """
+    today = date.today()
+    if day < today:
+        return MARKET_CACHE_TTL_OPEN if empty else MARKET_CACHE_TTL_CLOSED
+    return MARKET_CACHE_TTL_OPEN if day == today else None
+
+def ohlc_day_key(ticker: str, resolution: str, day: date) -> str:
+    """
+    Canonical key for one ticker's candles on one day. Every date range is assembled from these
+    per-day blocks, so overlapping ranges share cache entries.
+    """
+    return f"ohlc:{ticker}:{resolution}:{day.isoformat()}"
+
+def load_candles(value):
+    """Decode a cached day block, restoring the date and timestamp of each candle."""
+    candles = json.loads(value)
+    for candle in candles:
+        candle['date'] = date.fromisoformat(candle['date'])
+        if candle.get('timestamp'):
+            candle['timestamp'] = datetime.fromisoformat(candle['timestamp'])
+    return candles
+
+def dump_candles(candles) -> str:
+    return json.dumps(candles, default=lambda value: value.isoformat())
+
+def get_cached_ohlc_days(ticker: str, resolution: str, days):
+    """Return {day: list of candle dicts} for the days found in the cache; Redis errors count as misses."""
+    if not days:
+        return {}
+    try:
+        values = redis_client.mget([ohlc_day_key(ticker, resolution, day) for day in days])
+    except RedisError as e:
+        logger.warning(f"OHLC cache unavailable, reading from the database: {str(e)}")
+        return {}
+    return {day: load_candles(value) for day, value in zip(days, values) if value is not None}
+
+def cache_ohlc_days(ticker: str, resolution: str, candles_by_day):
+    """Store per-day candle blocks (including empty days) with a TTL based on whether the day is closed."""
+    try:
+        pipeline = redis_client.pipeline(transaction=False)
+        for day, candles in candles_by_day.items():
+            ttl = day_ttl(day, empty=not candles)
+            if ttl:
+                pipeline.setex(ohlc_day_key(ticker, resolution, day), ttl, dump_candles(candles))
+        pipeline.execute()
+    except RedisError as e:
+        logger.warning(f"Failed to cache OHLC blocks for ticker={ticker}: {str(e)}")
+
+def invalidate_ohlc_days(tickers, days):
+    """Drop the cached blocks of every resolution for the given tickers and days."""
+    keys = [
+        ohlc_day_key(ticker, resolution, day)
+        for ticker in tickers for day in days for resolution in CACHED_RESOLUTIONS
+    ]
+    if not keys:
+        return
+    try:
+        redis_client.delete(*keys)
+        logger.info(f"Invalidated {len(keys)} OHLC cache keys")
+    except RedisError as e:
+        logger.warning(f"Failed to invalidate OHLC cache keys: {str(e)}")
+
+def invalidate_ohlc_range(start: Optional[date] = None, end: Optional[date] = None):
+    """
+    Drop the cached blocks of every ticker and resolution for days from start to end inclusive
+    (unbounded when None), e.g. after the rollup is rebuilt for a range of days.
+    """
+    try:
+        keys = [
+            key for key in redis_client.scan_iter(match="ohlc:*", count=1000)
+            if (start is None or date.fromisoformat(key.rsplit(':', 1)[1]) >= start)
+            and (end is None or date.fromisoformat(key.rsplit(':', 1)[1]) <= end)
+        ]
+        if keys:
+            redis_client.delete(*keys)
+        logger.info(f"Invalidated {len(keys)} OHLC cache keys")
+    except RedisError as e:
+        logger.warning(f"Failed to invalidate OHLC cache keys: {str(e)}")
+
+def orders_generation_key(tick_id) -> str:
+    return f"orders_gen:{tick_id}"
+
+def orders_page_key(tick_id, generation, cursor: str, limit: int) -> str:
+    return f"orders:{tick_id}:{generation}:{cursor}:{limit}"
+
+def get_cached_orders_page(tick_id, cursor: str, limit: int):
+    """
+    Return (cached page or None, key to store the page under). Keys carry the ticker's generation,
+    so bumping it retires every cached page of that ticker at once.
+    """
+    try:
+        generation = redis_client.get(orders_generation_key(tick_id)) or 0
+        key = orders_page_key(tick_id, generation, cursor, limit)
+        value = redis_client.get(key)
+    except RedisError as e:
+        logger.warning(f"Orders cache unavailable, reading from the database: {str(e)}")
+        return None, None
+    return (json.loads(value) if value is not None else None), key
+
+def cache_orders_page(key: str, page):
+    try:
+        redis_client.setex(key, MARKET_CACHE_TTL_CLOSED, json.dumps(page))
+    except RedisError as e:
+        logger.warning(f"Failed to cache orders page {key}: {str(e)}")
+
+def bump_orders_generation(tick_ids):
+    """Retire the cached historical order pages of the given ticks, e.g. after a backfill."""
+    if not tick_ids:
+        return
+    try:
+        pipeline = redis_client.pipeline(transaction=False)
+        for tick_id in tick_ids:
+            pipeline.incr(orders_generation_key(tick_id))
+        pipeline.execute()
+    except RedisError as e:
+        logger.warning(f"Failed to bump orders cache generations: {str(e)}")
+
+def days_between(start_date: date, end_date: date):
+    """Every calendar day from start_date to end_date inclusive."""
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
@@ -0,0 +1,44 @@
+import os
+from typing import Optional
+from fastapi import HTTPException
+from redis import RedisError
+from app.config.redis_client_connection import redis_client
+from app.middleware.jwt import JWTHandler
+from app.middleware.logger import get_logger
+
+logger = get_logger()
+
+# How long a user's reads stay on the primary after they write; must cover the replicas' lag
+PRIMARY_PIN_SECONDS = int(os.getenv("DB_PRIMARY_PIN_SECONDS", 10))
+
+def primary_pin_key(user_id) -> str:
+    return f"db_pin:{user_id}"
+
+def pin_to_primary(user_id):
+    """
+    Read-your-writes: route the user's reads to the primary for PRIMARY_PIN_SECONDS, so a replica
+    that has not replayed their write yet cannot serve them stale data. Kept in Redis so every
+    worker sees the pin.
+    """
+    try:
+        redis_client.setex(primary_pin_key(user_id), PRIMARY_PIN_SECONDS, 1)
+    except RedisError as e:
+        logger.warning(f"Failed to pin user_id={user_id} to the primary: {str(e)}")
+
+def is_pinned_to_primary(user_id) -> bool:
+    """True while the user has a recent write; if Redis is unavailable the primary is assumed."""
+    try:
+        return bool(redis_client.exists(primary_pin_key(user_id)))
+    except RedisError as e:
+        logger.warning(f"Primary pin lookup failed, reading from the primary: {str(e)}")
+        return True
+
+def bearer_user_id(authorization: Optional[str]):
+    """The user id of a valid bearer token in an Authorization header, or None."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return JWTHandler.decode_token(token).get("sub")
+    except HTTPException:
+        return None
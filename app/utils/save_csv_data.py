@@ -1,153 +1,602 @@
 import os
+import io
+import sys
 import csv
 import time
+import uuid
+import hashlib
+import itertools
 import multiprocessing
 from datetime import datetime
+from collections import namedtuple
+from functools import partial
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select, update, delete, text, func, Date
+from sqlalchemy.dialects.postgresql import insert
 from app.db.models.ticks import Ticks
 from app.db.models.orders import Orders
+from app.db.models.ohlc_daily import OhlcDaily
+from app.db.models.ingestion_manifest import (
+    IngestionManifest,
+    MANIFEST_IN_PROGRESS,
+    MANIFEST_COMPLETED,
+    MANIFEST_FAILED,
+)
 from app.config.db_connection import get_db_connection
+from app.db.partitions import ORDERS_PARTITIONED, ensure_order_partitions, ensure_latest_order_timestamps
+from app.db.ohlc_rollup import refresh_ohlc_rollup
+from app.db.schema_upgrades import upgrade_orders_table
+from app.utils.extract_zip import list_zip_csv_members, open_csv_source, source_mtime
+from app.utils.tick_parser import column_indexes, parse_tick_rows
+
+try:
+    import resource
+except ImportError:  # resource is not available on Windows
+    resource = None
 
 # Directory containing CSV files
-CSV_DIRECTORY = r"D:\Project\Company Assignment\true_beacon\project\extractor"
+CSV_DIRECTORY = os.getenv("CSV_DIRECTORY", r"D:\Project\Company Assignment\true_beacon\project\extractor")
 
 # Batch size for database commits
 BATCH_SIZE = 5000  # Increased batch size
 
+# Loader mode: 'orm' uses bulk_insert_mappings, 'copy' streams batches with PostgreSQL COPY
+LOADER_MODE = os.getenv("LOADER_MODE", "orm").lower()
+
+# Column order used when streaming Orders rows through COPY
+COPY_COLUMNS = ['id', 'timestamp', 'ltp', 'buyprice', 'buyqty', 'sellprice', 'sellqty', 'ltq', 'openinterest', 'tick_id', 'ingestion_id']
+
+# Advisory lock key that keeps two loader runs from working on the same manifest at once
+LOADER_LOCK_ID = 7461636
+
+# Chunk size used when hashing files for the manifest
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Per-file result reported by process_csv
+LoadResult = namedtuple(
+    'LoadResult',
+    ['path', 'row_count', 'error', 'rows_per_sec', 'peak_memory_kb', 'status', 'post_load_seconds']
+)
+
 def find_csv_files(directory):
-    """Recursively find all CSV files in the specified directory and subdirectories."""
-    csv_files = []
+    """
+    Recursively find all CSV files in the specified directory and subdirectories.
+    CSVs inside zip archives (including nested zips) are listed as zip member sources
+    and streamed by the workers without extracting them to disk.
+    Returns {source: size in bytes}; member sizes come from the archive directories.
+    """
+    csv_files = {}
     for root, _, files in os.walk(directory):
         for file in files:
+            path = os.path.join(root, file)
             if file.endswith('.csv'):
-                csv_files.append(os.path.join(root, file))
+                csv_files[path] = os.path.getsize(path)
+            elif file.endswith('.zip'):
+                csv_files.update(list_zip_csv_members(path))
     return csv_files
 
 def init_db():
-    """Initialize the database engine and session for each process."""
+    """
+    Initialize the database engine and session for each process.
+    LOADER_DB_URL overrides the application connection, e.g. to load into a local benchmark database.
+    """
+    loader_db_url = os.getenv("LOADER_DB_URL")
+    if loader_db_url:
+        return create_engine(loader_db_url)
     db_connection_string, ssl_args = get_db_connection()
     engine = create_engine(db_connection_string, connect_args=ssl_args)
     return engine
 
-def process_csv(csv_path):
+# Engine reused by every file a worker process handles
+worker_engine = None
+
+# Ticker -> tick_id cache shared by every file a worker process handles
+worker_ticker_ids = None
+
+def get_worker_engine():
+    """Return this process's engine, creating it on first use so connections are reused across files."""
+    global worker_engine
+    if worker_engine is None:
+        worker_engine = init_db()
+    return worker_engine
+
+def load_ticker_ids(engine):
+    """Load the full ticker -> tick_id mapping from the Ticks table."""
+    with Session(engine) as session:
+        return {tick.ticker: tick.id for tick in session.query(Ticks.ticker, Ticks.id).all()}
+
+def get_worker_ticker_ids():
+    """Return this process's ticker cache, loading it from the database on first use."""
+    global worker_ticker_ids
+    if worker_ticker_ids is None:
+        worker_ticker_ids = load_ticker_ids(get_worker_engine())
+    return worker_ticker_ids
+
+def init_worker(ticker_ids=None):
+    """
+    Pool initializer: build one engine per worker before its file is dispatched to it,
+    and pre-warm the ticker cache with the mapping loaded once by the parent process.
+    """
+    global worker_ticker_ids
+    get_worker_engine()
+    if ticker_ids is not None:
+        worker_ticker_ids = dict(ticker_ids)
+
+def file_hash(csv_path):
+    """
+    Compute the SHA-256 hex digest of a file or zip member, reading it in fixed-size chunks.
+    Returns (digest, size in bytes), the size being counted while hashing.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open_csv_source(csv_path) as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+def claim_manifest_entry(session, csv_path, run_id):
+    """
+    Claim the manifest entry for the file's contents for this loader run, creating it if this content
+    has not been seen. Entries are keyed by content hash so a renamed or copied file is not loaded twice.
+    The claim is a single conditional UPDATE ... RETURNING, so when two workers of a run hold identical
+    contents only one of them gets the entry. Claims left by earlier runs are taken over, since runs
+    never overlap. Returns (entry, None), or (None, status) when the contents are already loaded
+    ('completed') or claimed by another worker of this run (in_progress).
+    """
+    content_hash, size = file_hash(csv_path)
+    mtime = source_mtime(csv_path)
+    session.execute(
+        insert(IngestionManifest)
+        .values(id=uuid.uuid4(), path=csv_path, size=size, mtime=mtime, content_hash=content_hash,
+                row_count=0, status=MANIFEST_IN_PROGRESS)
+        .on_conflict_do_nothing(index_elements=[IngestionManifest.content_hash])
+    )
+    entry = session.execute(
+        update(IngestionManifest)
+        .where(
+            IngestionManifest.content_hash == content_hash,
+            IngestionManifest.status != MANIFEST_COMPLETED,
+            IngestionManifest.claimed_by.is_distinct_from(run_id)
+        )
+        .values(path=csv_path, mtime=mtime, claimed_by=run_id)
+        .returning(IngestionManifest)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if entry is not None:
+        session.commit()
+        return entry, None
+
+    status = session.execute(
+        select(IngestionManifest.status).where(IngestionManifest.content_hash == content_hash)
+    ).scalar_one()
+    if status == MANIFEST_COMPLETED:
+        # Record where the contents were last seen, so this path is skipped without hashing next time
+        session.execute(
+            update(IngestionManifest)
+            .where(IngestionManifest.content_hash == content_hash)
+            .values(path=csv_path, mtime=mtime)
+        )
+    session.commit()
+    return None, status
+
+def discard_replaced_attempts(session, csv_path, run_id, ticker_to_id):
+    """
+    Delete unfinished manifest entries of csv_path whose contents were replaced before they completed,
+    together with the orders they committed (found by ingestion_id within the entry's timestamp range),
+    then repoint the affected ticks at their latest remaining order and recompute the affected candles.
+    Entries claimed by this run are left alone, as another worker may be loading them from a copy.
+    Returns the number of orders deleted.
+    """
+    stale_entries = session.execute(
+        delete(IngestionManifest)
+        .where(
+            IngestionManifest.path == csv_path,
+            IngestionManifest.status != MANIFEST_COMPLETED,
+            IngestionManifest.claimed_by.is_distinct_from(run_id)
+        )
+        .returning(IngestionManifest.id, IngestionManifest.first_timestamp, IngestionManifest.last_timestamp)
+    ).all()
+
+    # Report each deleted order's tick and day once instead of returning every row
+    affected = set()
+    for entry in stale_entries:
+        if entry.first_timestamp is None:
+            continue  # Nothing committed, or committed before orders were tagged
+        deleted = (
+            delete(Orders)
+            .where(
+                Orders.ingestion_id == entry.id,
+                Orders.timestamp.between(entry.first_timestamp, entry.last_timestamp)
+            )
+            .returning(Orders.tick_id, Orders.timestamp.cast(Date).label('day'))
+            .cte('deleted')
+        )
+        affected.update(session.execute(
+            select(deleted.c.tick_id, deleted.c.day, func.count()).group_by(deleted.c.tick_id, deleted.c.day)
+        ).all())
+    if not affected:
+        session.commit()
+        return 0
+
+    tick_ids = {tick_id for tick_id, _, _ in affected}
+    days = {day for _, day, _ in affected}
+    # Ticks left without orders lose their pointer and days left without orders lose their candle;
+    # each reset is committed together with its refresh
+    session.execute(
+        update(Ticks).where(Ticks.id.in_(tick_ids))
+        .values(latest_order_id=None, latest_order_timestamp=None)
+        .execution_options(synchronize_session=False)
+    )
+    update_latest_order_ids(session, tick_ids)
+    session.execute(delete(OhlcDaily).where(OhlcDaily.tick_id.in_(tick_ids), OhlcDaily.date.in_(days)))
+    refresh_ohlc_rollup(session, tick_ids, days)
+    invalidate_market_data_cache(ticker_to_id, tick_ids, days)
+    return sum(count for _, _, count in affected)
+
+def mark_manifest_failed(session, entry, error):
+    """Record a failed load so the next run resumes the file from its last committed batch."""
+    try:
+        entry.status = MANIFEST_FAILED
+        entry.error = error
+        session.commit()
+    except Exception:
+        session.rollback()
+
+def copy_orders(session, batch):
+    """
+    Stream a batch of order mappings into the orders table using PostgreSQL COPY.
+    Rows are written to an in-memory CSV buffer and sent over the session's connection,
+    so the batch is committed together with the rest of the session transaction.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for order in batch:
+        writer.writerow([uuid.uuid4()] + [order[column] for column in COPY_COLUMNS[1:]])
+    buffer.seek(0)
+
+    # Use the raw DBAPI (psycopg2) connection bound to the session's transaction
+    dbapi_connection = session.connection().connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {Orders.__tablename__} ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+def insert_orders(session, batch, mode):
+    """Insert a batch of order mappings using the selected loader mode."""
+    if mode == 'copy':
+        copy_orders(session, batch)
+    else:
+        session.bulk_insert_mappings(Orders, batch)
+
+def peak_memory_kb():
+    """
+    Return the peak resident set size of the current process in KB (None if unsupported).
+    Workers load a single file each, so in process_csv this is the peak for that file.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports ru_maxrss in bytes, Linux in kilobytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def batch_rows(rows, batch_size=BATCH_SIZE):
+    """Stage 2: group the row stream into lists of at most batch_size rows."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def upsert_tickers(session, tickers):
+    """
+    Insert tickers that don't exist yet with INSERT ... ON CONFLICT (ticker) DO NOTHING RETURNING
+    and return {ticker: tick_id} for all of them. Tickers inserted concurrently by another worker
+    are picked up with a follow-up SELECT instead of failing on uq_ticks_ticker.
+    """
+    # Insert in a stable order so concurrent workers lock conflicting rows in the same order
+    ordered_tickers = sorted(tickers)
+    result = session.execute(
+        insert(Ticks)
+        .values([{'id': uuid.uuid4(), 'ticker': ticker} for ticker in ordered_tickers])
+        .on_conflict_do_nothing(index_elements=[Ticks.ticker])
+        .returning(Ticks.ticker, Ticks.id)
+    )
+    ticker_ids = {row.ticker: row.id for row in result}
+
+    missing_tickers = set(ordered_tickers) - ticker_ids.keys()
+    if missing_tickers:
+        existing = session.execute(select(Ticks.ticker, Ticks.id).where(Ticks.ticker.in_(missing_tickers)))
+        ticker_ids.update({row.ticker: row.id for row in existing})
+    session.commit()
+    return ticker_ids
+
+def resolve_tick_ids(session, batches, ticker_to_id, ingestion_id=None):
+    """
+    Stage 3: replace the ticker symbol of every row with its tick_id and tag it with the manifest
+    entry loading it. Tickers missing from the cache are upserted as they appear, one batch at a time.
+    """
+    for batch in batches:
+        unique_tickers = {order['ticker'] for order in batch} - ticker_to_id.keys()
+        if unique_tickers:
+            ticker_to_id.update(upsert_tickers(session, unique_tickers))
+
+        for order in batch:
+            order['tick_id'] = ticker_to_id[order.pop('ticker')]
+            order['ingestion_id'] = ingestion_id
+        yield batch
+
+def update_latest_order_ids(session, tick_ids):
+    """
+    Point latest_order_id (and latest_order_timestamp) of the given ticks at their most recent
+    order in a single set-based UPDATE ... FROM (SELECT DISTINCT ON (tick_id) ...) statement.
+    """
+    if not tick_ids:
+        return
+
+    latest_orders = (
+        select(Orders.tick_id, Orders.id, Orders.timestamp)
+        .where(Orders.tick_id.in_(tick_ids))
+        .distinct(Orders.tick_id)
+        .order_by(Orders.tick_id, Orders.timestamp.desc())
+        .subquery()
+    )
+    session.execute(
+        update(Ticks)
+        .where(Ticks.id == latest_orders.c.tick_id)
+        .values(latest_order_id=latest_orders.c.id, latest_order_timestamp=latest_orders.c.timestamp)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+
+def invalidate_market_data_cache(ticker_to_id, tick_ids, days):
+    """
+    Drop cached OHLC blocks for the tickers and days a file touched and retire their cached order
+    pages, since backfilled files change days the API treats as closed. Uses the same Redis client
+    as the API, so whatever it caches is cleared; a missing Redis is reported without failing the load.
+    """
+    from redis import RedisError
+    from app.utils.market_data_cache import invalidate_ohlc_days, bump_orders_generation
+
+    tickers = [ticker for ticker, tick_id in ticker_to_id.items() if tick_id in tick_ids]
+    try:
+        invalidate_ohlc_days(tickers, days)
+        bump_orders_generation(tick_ids)
+    except RedisError as e:
+        print(f"Warning: could not invalidate the market data cache: {e}")
+
+def process_csv(csv_path, mode=LOADER_MODE, run_id=None):
     """
     Reads and processes the contents of a CSV file with specified headers.
     Combines Date and Time into a single Timestamp, removes '.NSE' from Ticker,
-    and processes rows in batches to reduce I/O operations.
+    and streams rows through a parse -> batch -> resolve -> write pipeline so that
+    at most one batch is held in memory regardless of file size.
+    Progress is recorded in the ingestion manifest in the same transaction as each batch,
+    so completed files are skipped and partial ones resume after their last committed batch.
+    run_id identifies the loader run claiming the file; a new one is made when it is not given.
+    Returns a LoadResult with throughput, peak memory and the duration of the post-load phase.
     """
+    if mode not in ('orm', 'copy'):
+        return LoadResult(csv_path, 0, f"Error: Unknown loader mode '{mode}'. Use 'orm' or 'copy'.", 0.0, peak_memory_kb(), MANIFEST_FAILED, 0.0)
+
     row_count = 0
-    engine = init_db()
-    session = Session(engine)
+    start_time = time.time()
+    engine = get_worker_engine()
+    # Keep manifest attributes loaded across commits to avoid a refresh query per batch
+    session = Session(engine, expire_on_commit=False)
+    entry = None
 
     try:
-        with open(csv_path, 'r', encoding='utf-8') as csv_file:
-            csv_reader = csv.DictReader(csv_file)
-            required_headers = ["Ticker", "Date", "Time", "LTP", "BuyPrice", "BuyQty",
-                                "SellPrice", "SellQty", "LTQ", "OpenInterest"]
-            if not all(header in csv_reader.fieldnames for header in required_headers):
-                return csv_path, 0, f"Error: CSV file {csv_path} does not have the required headers."
-
-            print(f"\nProcessing CSV file: {csv_path}")
-
-            # Pre-fetch all existing tickers from the Ticks table for quick lookup
-            existing_tickers = {tick.ticker: tick.id for tick in session.query(Ticks.ticker, Ticks.id).all()}
-
-            # Collect unique tickers from the CSV file
-            unique_tickers = set()
-            orders_data = []
-
-            for row in csv_reader:
-                ticker = row['Ticker'].replace('.NSE', '')
-                timestamp = datetime.strptime(f"{row['Date']} {row['Time']}", "%d/%m/%Y %H:%M:%S")
-
-                # Collect unique tickers
-                if ticker not in existing_tickers:
-                    unique_tickers.add(ticker)
-
-                # Prepare Orders data
-                orders_data.append({
-                    'timestamp': timestamp,
-                    'ltp': float(row['LTP']),
-                    'buyprice': float(row['BuyPrice']),
-                    'buyqty': int(row['BuyQty']),
-                    'sellprice': float(row['SellPrice']),
-                    'sellqty': int(row['SellQty']),
-                    'ltq': int(row['LTQ']),
-                    'openinterest': int(row['OpenInterest']),
-                    'ticker': ticker,  # Temporarily store ticker to map to tick_id later
-                })
-
-                row_count += 1
-
-            # Bulk insert unique tickers into Ticks table
-            if unique_tickers:
-                session.bulk_insert_mappings(Ticks, [{'ticker': ticker} for ticker in unique_tickers])
-                session.commit()
+        run_id = run_id or str(uuid.uuid4())
+        entry, claimed_status = claim_manifest_entry(session, csv_path, run_id)
+        # A load of contents no longer at this path is never resumed, so its committed rows are removed
+        discarded = discard_replaced_attempts(session, csv_path, run_id, get_worker_ticker_ids())
+        if discarded:
+            print(f"Discarded {discarded} rows of an unfinished load of the previous contents of {csv_path}")
+        if entry is None:
+            if claimed_status == MANIFEST_COMPLETED:
+                print(f"Skipping {csv_path}: contents already loaded")
+            else:
+                print(f"Skipping {csv_path}: the same contents are being loaded by another worker")
+            return LoadResult(csv_path, 0, None, 0.0, peak_memory_kb(), 'skipped', 0.0)
 
-                # Refresh existing_tickers with newly inserted tickers
-                new_tickers = session.query(Ticks.ticker, Ticks.id).filter(Ticks.ticker.in_(unique_tickers)).all()
-                existing_tickers.update({ticker.ticker: ticker.id for ticker in new_tickers})
+        with open_csv_source(csv_path) as raw_file, io.TextIOWrapper(raw_file, encoding='utf-8') as csv_file:
+            csv_reader = csv.reader(csv_file)
+            index = column_indexes(next(csv_reader, None))
+            if index is None:
+                error = f"Error: CSV file {csv_path} does not have the required headers."
+                mark_manifest_failed(session, entry, error)
+                return LoadResult(csv_path, 0, error, 0.0, peak_memory_kb(), MANIFEST_FAILED, 0.0)
 
-            # Fetch all tickers with their IDs for mapping
-            ticker_to_id = existing_tickers
+            print(f"\nProcessing CSV file: {csv_path} (mode={mode})")
 
-            # Map ticker to tick_id in orders_data
-            for order in orders_data:
-                ticker = order.pop('ticker')
-                order['tick_id'] = ticker_to_id[ticker]
+            # Skip blank lines the same way csv.DictReader does
+            rows = (row for row in csv_reader if row)
 
-            # Insert Orders in batches
-            for i in range(0, len(orders_data), BATCH_SIZE):
-                batch = orders_data[i:i + BATCH_SIZE]
-                session.bulk_insert_mappings(Orders, batch)
-                session.commit()
-                print(f"Processed {min(i + BATCH_SIZE, len(orders_data))} rows from {csv_path}")
+            # Worker-wide ticker cache, pre-warmed once per run instead of queried per file
+            ticker_to_id = get_worker_ticker_ids()
+            touched_tick_ids = set()
+            touched_days = set()
+
+            # Skip rows committed by a previous run, remembering their tickers for the latest_order_id update
+            if entry.row_count:
+                print(f"Resuming {csv_path} after {entry.row_count} committed rows")
+                skipped_tickers, skipped_dates = set(), set()
+                for row in itertools.islice(rows, entry.row_count):
+                    skipped_tickers.add(row[index['Ticker']].replace('.NSE', ''))
+                    skipped_dates.add(row[index['Date']])
+                touched_days.update(datetime.strptime(date_str, "%d/%m/%Y").date() for date_str in skipped_dates)
+                unknown_tickers = skipped_tickers - ticker_to_id.keys()
+                if unknown_tickers:
+                    ticker_to_id.update(upsert_tickers(session, unknown_tickers))
+                touched_tick_ids.update(ticker_to_id[ticker] for ticker in skipped_tickers)
 
-            # Update the latest_order_id in the Ticks table
-            for ticker, tick_id in ticker_to_id.items():
-                latest_order = session.query(Orders).filter_by(tick_id=tick_id).order_by(Orders.timestamp.desc()).first()
-                if latest_order:
-                    session.query(Ticks).filter_by(id=tick_id).update({'latest_order_id': latest_order.id})
+            entry.status = MANIFEST_IN_PROGRESS
+            session.commit()
+
+            # Build the streaming pipeline: parse -> batch -> resolve tick ids -> write
+            batches = resolve_tick_ids(session, batch_rows(parse_tick_rows(rows, index)), ticker_to_id, entry.id)
+            for batch in batches:
+                touched_tick_ids.update(order['tick_id'] for order in batch)
+                timestamps = {order['timestamp'] for order in batch}
+                touched_days.update(timestamp.date() for timestamp in timestamps)
+                if ORDERS_PARTITIONED:
+                    ensure_order_partitions(engine, timestamps)
+                insert_orders(session, batch, mode)
+                entry.row_count += len(batch)
+                # Bound the rows tagged with this entry, so a discarded attempt is deleted by a range scan
+                entry.first_timestamp = func.least(IngestionManifest.first_timestamp, min(timestamps))
+                entry.last_timestamp = func.greatest(IngestionManifest.last_timestamp, max(timestamps))
                 session.commit()
+                row_count += len(batch)
+                print(f"Processed {entry.row_count} rows from {csv_path}")
+
+            # Update the latest_order_id and daily candles only for the tickers and days this file touched
+            post_load_start = time.time()
+            update_latest_order_ids(session, touched_tick_ids)
+            refresh_ohlc_rollup(session, touched_tick_ids, touched_days)
+            invalidate_market_data_cache(ticker_to_id, touched_tick_ids, touched_days)
+            post_load_seconds = time.time() - post_load_start
 
-        return csv_path, row_count, None
+            entry.status = MANIFEST_COMPLETED
+            entry.error = None
+            session.commit()
+
+        elapsed_time = time.time() - start_time
+        rows_per_sec = row_count / elapsed_time if elapsed_time > 0 else 0.0
+        return LoadResult(csv_path, row_count, None, rows_per_sec, peak_memory_kb(), MANIFEST_COMPLETED, post_load_seconds)
     except Exception as e:
         session.rollback()
-        return csv_path, 0, str(e)
+        if entry is not None:
+            mark_manifest_failed(session, entry, str(e))
+        return LoadResult(csv_path, row_count, str(e), 0.0, peak_memory_kb(), MANIFEST_FAILED, 0.0)
     finally:
         session.close()
 
-def main():
-    # Recursively find all CSV files in the specified directory
-    csv_files = find_csv_files(CSV_DIRECTORY)
+def upgrade_manifest_table(engine):
+    """
+    Add the manifest columns introduced after the table was first created, and the orders column
+    tagging rows with their manifest entry, if they are missing.
+    """
+    with engine.begin() as connection:
+        connection.execute(text(f"ALTER TABLE {IngestionManifest.__tablename__} ADD COLUMN IF NOT EXISTS mtime DOUBLE PRECISION"))
+        connection.execute(text(f"ALTER TABLE {IngestionManifest.__tablename__} ADD COLUMN IF NOT EXISTS claimed_by VARCHAR"))
+        connection.execute(text(f"ALTER TABLE {IngestionManifest.__tablename__} ADD COLUMN IF NOT EXISTS first_timestamp TIMESTAMP WITH TIME ZONE"))
+        connection.execute(text(f"ALTER TABLE {IngestionManifest.__tablename__} ADD COLUMN IF NOT EXISTS last_timestamp TIMESTAMP WITH TIME ZONE"))
+        upgrade_orders_table(connection)
+
+def load_completed_files(engine):
+    """Return {path: (size, mtime)} for every file the manifest records as completed."""
+    with Session(engine) as session:
+        rows = (
+            session.query(IngestionManifest.path, IngestionManifest.size, IngestionManifest.mtime)
+            .filter_by(status=MANIFEST_COMPLETED)
+            .all()
+        )
+    return {row.path: (row.size, row.mtime) for row in rows}
+
+def load_files(csv_directory=CSV_DIRECTORY, mode=LOADER_MODE):
+    """
+    Load every pending CSV under csv_directory with a worker pool.
+    Returns (results, elapsed_time); results is empty when there is nothing new to load.
+    """
+    # Recursively find all CSV files in the specified directory, with their sizes
+    file_sizes = find_csv_files(csv_directory)
+    csv_files = list(file_sizes)
 
     if not csv_files:
-        print(f"No CSV files found in {CSV_DIRECTORY} or its subdirectories.")
-        return
+        print(f"No CSV files found in {csv_directory} or its subdirectories.")
+        return [], 0.0
 
-    start_time = time.time()
+    engine = init_db()
+    IngestionManifest.__table__.create(bind=engine, checkfirst=True)
+    upgrade_manifest_table(engine)
+    with engine.begin() as connection:
+        ensure_latest_order_timestamps(connection)
+    OhlcDaily.__table__.create(bind=engine, checkfirst=True)
 
-    # Process CSV files using multiprocessing
-    with multiprocessing.Pool(processes=multiprocessing.cpu_count()) as pool:
-        results = pool.map(process_csv, csv_files)
+    # Hold an advisory lock for the whole run so overlapping scheduled runs don't load the same files
+    lock_connection = engine.connect()
+    acquired = lock_connection.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": LOADER_LOCK_ID}).scalar()
+    lock_connection.commit()  # Session-level advisory locks outlive the transaction
+    if not acquired:
+        print("Another loader run is in progress. Exiting.")
+        lock_connection.close()
+        return [], 0.0
+
+    try:
+        # Skip files already recorded as completed with the same size and modification time, without
+        # re-hashing them; a file rewritten in place is hashed again and loaded if its contents changed
+        completed_files = load_completed_files(engine)
+        pending_files = [
+            path for path in csv_files if completed_files.get(path) != (file_sizes[path], source_mtime(path))
+        ]
+        print(f"Found {len(csv_files)} files, {len(csv_files) - len(pending_files)} already loaded")
+        if not pending_files:
+            return [], 0.0
+
+        # Dispatch the largest files first so no worker is left with a big file at the end
+        pending_files.sort(key=file_sizes.get, reverse=True)
+        total_bytes = sum(file_sizes[path] for path in pending_files)
+
+        start_time = time.time()
+        print(f"Loading {len(pending_files)} files with loader mode: {mode}")
+
+        # Manifest entries are claimed for this run, so two workers never load identical contents
+        run_id = str(uuid.uuid4())
+
+        # Load the ticker mapping once and hand it to every worker to pre-warm its cache
+        ticker_ids = load_ticker_ids(engine)
+
+        # Process CSV files using multiprocessing, one engine per worker. Each worker loads one file
+        # and is then replaced, so its peak RSS is that file's peak rather than the largest file it saw
+        results = []
+        done_bytes = 0
+        with multiprocessing.Pool(processes=multiprocessing.cpu_count(), initializer=init_worker,
+                                  initargs=(ticker_ids,), maxtasksperchild=1) as pool:
+            for result in pool.imap_unordered(partial(process_csv, mode=mode, run_id=run_id), pending_files, chunksize=1):
+                results.append(result)
+                done_bytes += file_sizes[result.path]
+                percent = done_bytes / total_bytes * 100 if total_bytes else 100.0
+                print(f"[{len(results)}/{len(pending_files)} files, {percent:.1f}% of bytes, "
+                      f"{time.time() - start_time:.0f}s] Finished {result.path}")
+        return results, time.time() - start_time
+    finally:
+        lock_connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": LOADER_LOCK_ID})
+        lock_connection.commit()
+        lock_connection.close()
+        engine.dispose()
+
+def main():
+    results, elapsed_time = load_files(CSV_DIRECTORY, LOADER_MODE)
+    if not results:
+        return
 
     # Calculate and print elapsed time
-    elapsed_time = time.time() - start_time
     minutes, seconds = divmod(elapsed_time, 60)
     milliseconds = int((elapsed_time - int(elapsed_time)) * 1000)
     print(f"\n\nTotal time taken: {int(minutes)}:{int(seconds)}:{milliseconds}")
 
     # Print results including row counts and any errors
     total_rows = 0
-    for path, count, error in results:
-        if error:
-            print(f"Error with {path}: {error}")
+    for result in results:
+        if result.error:
+            print(f"Error with {result.path} after {result.row_count} committed rows: {result.error}")
+        elif result.status == 'skipped':
+            print(f"{result.path}: skipped, contents already loaded or loaded by another worker")
         else:
-            print(f"{path}: {count} rows processed")
-            total_rows += count
+            peak = f"{result.peak_memory_kb / 1024:.1f} MB" if result.peak_memory_kb is not None else "n/a"
+            print(f"{result.path}: {result.row_count} rows processed ({result.rows_per_sec:.0f} rows/sec, "
+                  f"peak memory {peak}, post-load {result.post_load_seconds:.2f}s)")
+            total_rows += result.row_count
 
     print(f"\nTotal rows processed across all files: {total_rows}")
+    if elapsed_time > 0:
+        print(f"Overall throughput ({LOADER_MODE}): {total_rows / elapsed_time:.0f} rows/sec")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,21 @@
+from functools import lru_cache
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+@lru_cache(maxsize=None)
+def response_adapter(response_type) -> TypeAdapter:
+    """TypeAdapter for a response type, built once; its serializer is compiled with it."""
+    return TypeAdapter(response_type)
+
+def trusted_response(content, response_type, status_code: int = 200, headers=None) -> Response:
+    """
+    Serialize a service result straight to JSON bytes with the precompiled serializer of its type.
+    The result is not validated again against the route's response_model, so only pass results the
+    service built from its own schemas. The route keeps response_model for the OpenAPI docs.
+    """
+    return Response(
+        response_adapter(response_type).dump_json(content),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers
+    )
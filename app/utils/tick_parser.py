@@ -0,0 +1,117 @@
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for decode_chunk_columns
+    np = None
+
+# Headers every tick CSV must provide
+REQUIRED_HEADERS = ["Ticker", "Date", "Time", "LTP", "BuyPrice", "BuyQty",
+                    "SellPrice", "SellQty", "LTQ", "OpenInterest"]
+
+def column_indexes(header):
+    """
+    Map each required header to its position in the CSV header row.
+    Returns None if any required header is missing.
+    """
+    if not header:
+        return None
+    positions = {name: index for index, name in enumerate(header)}
+    if not all(name in positions for name in REQUIRED_HEADERS):
+        return None
+    return {name: positions[name] for name in REQUIRED_HEADERS}
+
+def strip_ticker(raw_ticker, cache):
+    """Remove the '.NSE' suffix from a ticker, memoising the result since symbols repeat."""
+    ticker = cache.get(raw_ticker)
+    if ticker is None:
+        ticker = cache[raw_ticker] = raw_ticker.replace('.NSE', '')
+    return ticker
+
+def parse_tick_rows(rows, index):
+    """
+    Yield one order mapping per csv.reader row using positional column indexes.
+    The parsed DD/MM/YYYY date is cached (it is constant within a file) and HH:MM:SS is parsed
+    arithmetically, which avoids a datetime.strptime call per row.
+    """
+    i_ticker, i_date, i_time = index['Ticker'], index['Date'], index['Time']
+    i_ltp, i_buyprice, i_buyqty = index['LTP'], index['BuyPrice'], index['BuyQty']
+    i_sellprice, i_sellqty = index['SellPrice'], index['SellQty']
+    i_ltq, i_openinterest = index['LTQ'], index['OpenInterest']
+
+    ticker_cache = {}
+    cached_date = None
+    year = month = day = 0
+
+    for row in rows:
+        date_str = row[i_date]
+        if date_str != cached_date:
+            day_str, month_str, year_str = date_str.split('/')
+            year, month, day = int(year_str), int(month_str), int(day_str)
+            cached_date = date_str
+
+        hour, minute, second = row[i_time].split(':')
+        yield {
+            'timestamp': datetime(year, month, day, int(hour), int(minute), int(second)),
+            'ltp': float(row[i_ltp]),
+            'buyprice': float(row[i_buyprice]),
+            'buyqty': int(row[i_buyqty]),
+            'sellprice': float(row[i_sellprice]),
+            'sellqty': int(row[i_sellqty]),
+            'ltq': int(row[i_ltq]),
+            'openinterest': int(row[i_openinterest]),
+            'ticker': strip_ticker(row[i_ticker], ticker_cache),  # Temporarily store ticker to map to tick_id later
+        }
+
+def seconds_of_day(times):
+    """
+    Convert a sequence of HH:MM:SS strings into an int64 array of seconds since midnight.
+    Zero-padded times are decoded digit by digit from one byte buffer; anything else falls back
+    to per-row parsing.
+    """
+    joined = ''.join(times).encode('ascii')
+    if len(joined) == 8 * len(times):
+        digits = np.frombuffer(joined, dtype=np.uint8).reshape(-1, 8).astype(np.int64) - ord('0')
+        colon = ord(':') - ord('0')
+        if (digits[:, 2] == colon).all() and (digits[:, 5] == colon).all():
+            return ((digits[:, 0] * 10 + digits[:, 1]) * 3600
+                    + (digits[:, 3] * 10 + digits[:, 4]) * 60
+                    + digits[:, 6] * 10 + digits[:, 7])
+
+    seconds = []
+    for time_str in times:
+        hour, minute, second = time_str.split(':')
+        seconds.append(int(hour) * 3600 + int(minute) * 60 + int(second))
+    return np.array(seconds, dtype=np.int64)
+
+def decode_chunk_columns(rows, index):
+    """
+    Decode a chunk of csv.reader rows into NumPy column arrays keyed by Orders column name.
+    Timestamps are returned as datetime64[s]; tickers as an object array with '.NSE' removed.
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required to decode tick chunks into column arrays")
+
+    if not rows:
+        return {}
+
+    # One list per required column; cheaper than transposing every field with zip(*rows)
+    columns = {name: [row[position] for row in rows] for name, position in index.items()}
+
+    # Parse each distinct date once, then add the seconds of the day
+    unique_dates, date_codes = np.unique(np.array(columns['Date']), return_inverse=True)
+    day_starts = np.array([datetime.strptime(d, "%d/%m/%Y") for d in unique_dates], dtype='datetime64[s]')
+    timestamps = day_starts[date_codes] + seconds_of_day(columns['Time']).astype('timedelta64[s]')
+
+    ticker_cache = {}
+    return {
+        'timestamp': timestamps,
+        'ltp': np.array(columns['LTP'], dtype=np.float64),
+        'buyprice': np.array(columns['BuyPrice'], dtype=np.float64),
+        'buyqty': np.array(columns['BuyQty'], dtype=np.int64),
+        'sellprice': np.array(columns['SellPrice'], dtype=np.float64),
+        'sellqty': np.array(columns['SellQty'], dtype=np.int64),
+        'ltq': np.array(columns['LTQ'], dtype=np.int64),
+        'openinterest': np.array(columns['OpenInterest'], dtype=np.int64),
+        'ticker': np.array([strip_ticker(ticker, ticker_cache) for ticker in columns['Ticker']], dtype=object),
+    }
@@ -0,0 +1,66 @@
+import os
+import time
+import asyncio
+from bisect import bisect_left
+from sqlalchemy import select, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.ticks import Ticks
+from app.middleware.logger import get_logger
+
+logger = get_logger()
+
+# Seconds before the in-memory symbol list is reloaded, to pick up tickers added by the CSV loader
+TICKER_INDEX_TTL = float(os.getenv("TICKER_INDEX_TTL", 60))
+
+class TickerPrefixIndex:
+    """
+    Sorted in-memory array of ticker symbols for typeahead: a prefix lookup is a binary search
+    plus a short forward scan, with no database round trip.
+    """
+    def __init__(self, ttl: float = TICKER_INDEX_TTL):
+        self.ttl = ttl
+        self.keys = []      # Upper-cased symbols, sorted
+        self.entries = []   # (id, ticker) aligned with keys
+        self.loaded_at = None
+        # Created on first use: on Python 3.9 an asyncio.Lock binds to the loop current when it is
+        # built, and this index is built at import time, before the server's loop exists
+        self.lock = None
+
+    def invalidate(self):
+        """Force a reload on the next lookup."""
+        self.loaded_at = None
+
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+
+    async def refresh(self, db: AsyncSession):
+        result = await db.execute(select(Ticks.id, Ticks.ticker))
+        rows = sorted(((ticker.upper(), tick_id, ticker) for tick_id, ticker in result.all()))
+        self.keys = [key for key, _, _ in rows]
+        self.entries = [(tick_id, ticker) for _, tick_id, ticker in rows]
+        self.loaded_at = time.monotonic()
+        logger.info(f"Ticker prefix index loaded with {len(self.keys)} symbols")
+
+    async def search(self, db: AsyncSession, prefix: str, limit: int = 10):
+        """Return up to limit (id, ticker) pairs whose symbol starts with prefix, case-insensitively."""
+        if self.is_stale():
+            if self.lock is None:
+                self.lock = asyncio.Lock()
+            async with self.lock:
+                if self.is_stale():
+                    await self.refresh(db)
+
+        prefix = prefix.upper()
+        matches = []
+        position = bisect_left(self.keys, prefix)
+        while position < len(self.keys) and len(matches) < limit and self.keys[position].startswith(prefix):
+            matches.append(self.entries[position])
+            position += 1
+        return matches
+
+ticker_prefix_index = TickerPrefixIndex()
+
+# Tickers inserted through the ORM in this process show up on the next lookup
+@event.listens_for(Ticks, 'after_insert')
+def invalidate_ticker_prefix_index(mapper, connection, target):
+    ticker_prefix_index.invalidate()
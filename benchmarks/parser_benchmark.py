@@ -0,0 +1,75 @@
+"""
+Microbenchmark comparing the original DictReader/strptime tick parser with the
+positional fast-path parser and NumPy chunk decoding in app.utils.tick_parser.
+
+Usage: python -m benchmarks.parser_benchmark [rows]
+"""
+import sys
+import csv
+import time
+import itertools
+import tempfile
+from datetime import datetime
+from app.utils.tick_parser import column_indexes, parse_tick_rows, decode_chunk_columns
+from benchmarks.synthetic_ticks import generate_dataset
+
+DEFAULT_ROWS = 1_000_000
+CHUNK_SIZE = 100_000
+
+def legacy_parse(path):
+    """The original per-row DictReader + strptime parser from save_csv_data.process_csv."""
+    with open(path, 'r', encoding='utf-8') as csv_file:
+        for row in csv.DictReader(csv_file):
+            yield {
+                'timestamp': datetime.strptime(f"{row['Date']} {row['Time']}", "%d/%m/%Y %H:%M:%S"),
+                'ltp': float(row['LTP']),
+                'buyprice': float(row['BuyPrice']),
+                'buyqty': int(row['BuyQty']),
+                'sellprice': float(row['SellPrice']),
+                'sellqty': int(row['SellQty']),
+                'ltq': int(row['LTQ']),
+                'openinterest': int(row['OpenInterest']),
+                'ticker': row['Ticker'].replace('.NSE', ''),
+            }
+
+def fast_parse(path):
+    with open(path, 'r', encoding='utf-8') as csv_file:
+        reader = csv.reader(csv_file)
+        index = column_indexes(next(reader))
+        yield from parse_tick_rows(reader, index)
+
+def numpy_parse(path):
+    with open(path, 'r', encoding='utf-8') as csv_file:
+        reader = csv.reader(csv_file)
+        index = column_indexes(next(reader))
+        while True:
+            chunk = list(itertools.islice(reader, CHUNK_SIZE))
+            if not chunk:
+                break
+            yield decode_chunk_columns(chunk, index)
+
+def timed(label, parser, path, rows):
+    start = time.perf_counter()
+    for _ in parser(path):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed:8.2f}s  {rows / elapsed:12,.0f} rows/sec")
+    return elapsed
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"Generating {rows:,} rows...")
+        path, = generate_dataset(tmp_dir, tickers=50, days=1, rows=rows)
+
+        # Sanity check: both row parsers must produce identical mappings
+        sample = 1000
+        assert list(itertools.islice(legacy_parse(path), sample)) == list(itertools.islice(fast_parse(path), sample))
+
+        legacy = timed("legacy (DictReader)", legacy_parse, path, rows)
+        fast = timed("fast path", fast_parse, path, rows)
+        numpy_time = timed("numpy chunks", numpy_parse, path, rows)
+        print(f"\nSpeedup vs legacy: fast path {legacy / fast:.1f}x, numpy chunks {legacy / numpy_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
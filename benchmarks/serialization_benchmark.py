@@ -0,0 +1,154 @@
+"""
+Microbenchmark of the response serialization path for TickerSearchResponse and OrderDetailsResponse.
+
+"legacy" rebuilds the original schemas (a Python json_encoder for UUIDs, the per-row validator on
+TickerWithDates, three timestamp formats per order) and serializes the way FastAPI does for a route
+with a response_model: dump the result, validate it again, serialize it and encode it with json.
+"fast" uses the current schemas and app.utils.serialization.trusted_response, as the routes do now.
+
+Usage: python -m benchmarks.serialization_benchmark [rows] [repeats]
+"""
+import sys
+import json
+import time
+import uuid
+import asyncio
+from typing import List, Optional
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+from pydantic import ConfigDict, validator
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from app.schemas.order import OrderResponse
+from app.schemas.tick import OrderDetailsResponse, TickerSearchResponse, TickerWithDates
+from app.utils.serialization import trusted_response
+
+DEFAULT_ROWS = 1000
+DEFAULT_REPEATS = 50
+
+LEGACY_CONFIG = ConfigDict(json_encoders={uuid.UUID: lambda v: str(v), datetime: lambda v: v.isoformat()})
+
+class LegacyOrderResponse(OrderResponse):
+    model_config = LEGACY_CONFIG
+
+class LegacyOrderDetailsResponse(OrderDetailsResponse):
+    model_config = LEGACY_CONFIG
+    orders: List[LegacyOrderResponse]
+
+class LegacyTickerWithDates(TickerWithDates):
+    model_config = LEGACY_CONFIG
+
+    @validator('id', 'latest_timestamp', pre=True)
+    def convert_uuid_and_datetime(cls, value):
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+class LegacyTickerSearchResponse(TickerSearchResponse):
+    model_config = LEGACY_CONFIG
+    tickers_with_dates: List[LegacyTickerWithDates]
+
+def synthetic_orders(rows):
+    """Order rows shaped like the Orders ORM objects the service reads."""
+    tick_id = uuid.uuid4()
+    start = datetime(2022, 4, 5, 9, 15, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), tick_id=tick_id, timestamp=start + timedelta(seconds=i), ltp=150.0 + i % 100 / 20,
+            buyprice=149.95, buyqty=100 + i % 7, sellprice=150.05, sellqty=90 + i % 11, ltq=i % 50, openinterest=1000 + i
+        )
+        for i in range(rows)
+    ]
+
+def synthetic_tickers(rows):
+    """Latest-quote rows as returned by latest_quotes_query."""
+    start = datetime(2022, 4, 5, 15, 29, tzinfo=timezone.utc)
+    return [
+        (uuid.uuid4(), f"SYM{i:04d}", start - timedelta(seconds=i), 100 + i % 9, 150.05, 150.0 + i % 13, i % 50)
+        for i in range(rows)
+    ]
+
+def fastapi_render(field, content) -> bytes:
+    """What FastAPI does with a returned model on a route with response_model, up to the body bytes."""
+    return JSONResponse(asyncio.run(serialize_response(field=field, response_content=content))).body
+
+def legacy_orders_page(orders, field):
+    page = LegacyOrderDetailsResponse(
+        ticker="SYM0001",
+        orders=[
+            LegacyOrderResponse(
+                id=order.id, ltp=order.ltp, sellprice=order.sellprice, sellqty=order.sellqty, ltq=order.ltq,
+                openinterest=order.openinterest, tick_id=order.tick_id, buyprice=order.buyprice, buyqty=order.buyqty,
+                timestamp=order.timestamp.isoformat(),
+                date=order.timestamp.strftime("%d/%m/%Y"),
+                time=order.timestamp.strftime("%H:%M:%S")
+            )
+            for order in orders
+        ],
+        total=len(orders), skip=0, limit=len(orders)
+    )
+    return fastapi_render(field, page)
+
+def fast_orders_page(orders, field):
+    page = OrderDetailsResponse(
+        ticker="SYM0001", orders=[OrderResponse.from_orm(order) for order in orders],
+        total=len(orders), skip=0, limit=len(orders)
+    )
+    return trusted_response(page, OrderDetailsResponse).body
+
+def legacy_tickers_page(tickers, field):
+    page = LegacyTickerSearchResponse(
+        tickers_with_dates=[
+            LegacyTickerWithDates(
+                id=str(tick_id), ticker=ticker, dates=[timestamp.strftime("%d-%m-%Y")], interval=None,
+                sellqty=sellqty, sellprice=sellprice, ltp=ltp, ltq=ltq, latest_timestamp=timestamp.isoformat()
+            )
+            for tick_id, ticker, timestamp, sellqty, sellprice, ltp, ltq in tickers
+        ],
+        total=len(tickers), skip=0, limit=len(tickers)
+    )
+    return fastapi_render(field, page)
+
+def fast_tickers_page(tickers, field):
+    page = TickerSearchResponse(
+        tickers_with_dates=[
+            TickerWithDates(
+                id=tick_id, ticker=ticker, dates=[timestamp.strftime("%d-%m-%Y")],
+                sellqty=sellqty, sellprice=sellprice, ltp=ltp, ltq=ltq, latest_timestamp=timestamp.isoformat()
+            )
+            for tick_id, ticker, timestamp, sellqty, sellprice, ltp, ltq in tickers
+        ],
+        total=len(tickers), skip=0, limit=len(tickers)
+    )
+    return trusted_response(page, TickerSearchResponse).body
+
+def timed(label, build, rows, field, repeats):
+    build(rows, field)  # Warm up; the first call builds the serializer
+    start = time.perf_counter()
+    for _ in range(repeats):
+        build(rows, field)
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{label:<30} {elapsed * 1000:8.2f} ms/page")
+    return elapsed
+
+def compare(name, legacy_build, fast_build, rows, field, repeats):
+    # Sanity check: both paths must produce the same document
+    assert json.loads(legacy_build(rows, field)) == json.loads(fast_build(rows, None))
+    legacy = timed(f"{name} legacy", legacy_build, rows, field, repeats)
+    fast = timed(f"{name} fast", fast_build, rows, None, repeats)
+    print(f"{'':<30} {legacy / fast:8.1f}x faster\n")
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_REPEATS
+    print(f"{rows:,} rows per page, {repeats} repeats\n")
+    compare("OrderDetailsResponse", legacy_orders_page, fast_orders_page, synthetic_orders(rows),
+            create_model_field("Response_orders", LegacyOrderDetailsResponse, mode="serialization"), repeats)
+    compare("TickerSearchResponse", legacy_tickers_page, fast_tickers_page, synthetic_tickers(rows),
+            create_model_field("Response_tickers", LegacyTickerSearchResponse, mode="serialization"), repeats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Deterministic synthetic tick data generator.
+
+Writes one CSV per trading day with the exact header the loader expects, optionally
+wrapping each day file in nested zip archives so the zip streaming path is exercised.
+
+Usage: python -m benchmarks.synthetic_ticks OUTPUT_DIR [--tickers N] [--days N] [--rows N] [--zip-depth N]
+"""
+import io
+import os
+import csv
+import random
+import zipfile
+import argparse
+from datetime import date, timedelta
+from app.utils.tick_parser import REQUIRED_HEADERS
+
+# Trading session modelled by the generator: 09:15:00 for 6h15m
+SESSION_START_SECONDS = 9 * 3600 + 15 * 60
+SESSION_LENGTH_SECONDS = 6 * 3600 + 15 * 60
+
+START_DATE = date(2022, 4, 4)
+
+def ticker_symbols(tickers):
+    """Return the synthetic symbols in the raw '.NSE' form found in exchange files."""
+    return [f"SYM{i:04d}.NSE" for i in range(tickers)]
+
+def write_tick_rows(f, trade_date, symbols, rows, rng, prices):
+    """
+    Write one day of rows to a text stream. Timestamps increase monotonically through the
+    session and symbols are interleaved, like an exchange tick dump.
+    """
+    writer = csv.writer(f, lineterminator='\n')
+    writer.writerow(REQUIRED_HEADERS)
+    date_str = trade_date.strftime("%d/%m/%Y")
+    for i in range(rows):
+        symbol = symbols[i % len(symbols)]
+        seconds = SESSION_START_SECONDS + i * SESSION_LENGTH_SECONDS // rows
+        price = prices[symbol] = round(max(1.0, prices[symbol] * (1 + rng.gauss(0, 0.0005))), 2)
+        writer.writerow([
+            symbol, date_str, f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}",
+            price, round(price - 0.05, 2), rng.randint(1, 500), round(price + 0.05, 2), rng.randint(1, 500),
+            rng.randint(1, 100), rng.randint(0, 10000)
+        ])
+
+def wrap_in_zips(name, payload, depth):
+    """Wrap a file payload in depth - 1 levels of nested zips; returns (member_name, bytes)."""
+    for level in range(depth - 1):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+            zip_ref.writestr(name, payload)
+        name, payload = f"{os.path.splitext(name)[0]}_l{level + 1}.zip", buffer.getvalue()
+    return name, payload
+
+def generate_dataset(output_dir, tickers=50, days=5, rows=100_000, zip_depth=0, seed=42):
+    """
+    Generate `days` daily files of `rows` rows each across `tickers` symbols.
+    With zip_depth=0 plain CSVs are written; with zip_depth=N every day file is placed
+    N archives deep inside ticks_dataset.zip. Returns the list of files written.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    symbols = ticker_symbols(tickers)
+    prices = {symbol: rng.uniform(100, 2000) for symbol in symbols}
+
+    if zip_depth == 0:
+        paths = []
+        for day in range(days):
+            trade_date = START_DATE + timedelta(days=day)
+            path = os.path.join(output_dir, f"ticks_{trade_date:%Y%m%d}.csv")
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                write_tick_rows(f, trade_date, symbols, rows, rng, prices)
+            paths.append(path)
+        return paths
+
+    archive_path = os.path.join(output_dir, "ticks_dataset.zip")
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for day in range(days):
+            trade_date = START_DATE + timedelta(days=day)
+            buffer = io.StringIO()
+            write_tick_rows(buffer, trade_date, symbols, rows, rng, prices)
+            name, payload = wrap_in_zips(f"ticks_{trade_date:%Y%m%d}.csv", buffer.getvalue().encode('utf-8'), zip_depth)
+            archive.writestr(f"{trade_date:%Y-%m}/{name}", payload)
+    return [archive_path]
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic tick CSVs")
+    parser.add_argument("output_dir")
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per daily file")
+    parser.add_argument("--zip-depth", type=int, default=0, help="Nest each day file this many zips deep (0 = plain CSV)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    paths = generate_dataset(args.output_dir, args.tickers, args.days, args.rows, args.zip_depth, args.seed)
+    print(f"Wrote {len(paths)} file(s) with {args.days * args.rows:,} rows to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
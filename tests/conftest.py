@@ -0,0 +1,2 @@
+# Manual connection checks that run against live services when executed; pytest skips them
+collect_ignore = ["session_connection_test.py", "test_database_connection.py", "test_websocket.py"]
@@ -0,0 +1,30 @@
+import pytest
+import app.utils.columnar as columnar
+from app.utils.columnar import ARROW_MEDIA_TYPE, negotiate_binary_format
+
+@pytest.mark.parametrize("accept,expected", [
+    (None, None),
+    ("", None),
+    ("application/json", None),
+    ("*/*", None),
+    ("application/*", None),
+    (ARROW_MEDIA_TYPE, 'arrow'),
+    ("application/msgpack", 'msgpack'),
+    ("application/x-msgpack", 'msgpack'),
+    ("Application/MsgPack", 'msgpack'),
+    (f"application/json, {ARROW_MEDIA_TYPE}", 'arrow'),
+    (f"application/json;q=1.0, {ARROW_MEDIA_TYPE};q=0.5", None),
+    (f"{ARROW_MEDIA_TYPE};q=0.9, application/json;q=0.9", 'arrow'),
+    (f"{ARROW_MEDIA_TYPE};q=0.2, application/msgpack;q=0.8", 'msgpack'),
+    (f"application/msgpack, {ARROW_MEDIA_TYPE}", 'msgpack'),
+    (f"{ARROW_MEDIA_TYPE};q=0", None),
+    (f"{ARROW_MEDIA_TYPE};q=abc", None),
+    ("text/csv", None),
+])
+def test_negotiate_binary_format(accept, expected):
+    assert negotiate_binary_format(accept) == expected
+
+def test_formats_that_are_not_installed_fall_back_to_json(monkeypatch):
+    monkeypatch.setattr(columnar, "pa", None)
+    assert negotiate_binary_format(ARROW_MEDIA_TYPE) is None
+    assert negotiate_binary_format(f"{ARROW_MEDIA_TYPE}, application/msgpack;q=0.5") == 'msgpack'
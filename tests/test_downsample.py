@@ -0,0 +1,84 @@
+import math
+import numpy as np
+import pytest
+import app.utils.downsample as downsample
+from app.utils.downsample import StreamingDownsampler, convex_hull_indexes
+
+def reference_lttb(t, v, points):
+    """Whole-array LTTB with the canonical bucket edges, as in Steinarsson's reference implementation."""
+    if points >= len(t):
+        return t.tolist(), v.tolist()
+    every = (len(t) - 2) / (points - 2)
+    kept = [0]
+    for bucket in range(points - 2):
+        mean_start, mean_end = math.floor((bucket + 1) * every) + 1, min(math.floor((bucket + 2) * every) + 1, len(t))
+        mean_t, mean_v = t[mean_start:mean_end].mean(), v[mean_start:mean_end].mean()
+        start, end = math.floor(bucket * every) + 1, math.floor((bucket + 1) * every) + 1
+        prev = kept[-1]
+        areas = np.abs((t[prev] - mean_t) * (v[start:end] - v[prev]) - (t[prev] - t[start:end]) * (mean_v - v[prev]))
+        kept.append(start + int(np.argmax(areas)))
+    kept.append(len(t) - 1)
+    return t[kept].tolist(), v[kept].tolist()
+
+def downsample_in_chunks(t, v, points, method, chunk):
+    downsampler = StreamingDownsampler(len(t), points, method)
+    for start in range(0, len(t), chunk):
+        downsampler.feed(t[start:start + chunk], v[start:start + chunk])
+    return downsampler.finish()
+
+def random_walk(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.arange(rows, dtype=np.float64) * 1.5 + 1.6e9, np.cumsum(rng.normal(size=rows)) + 100
+
+@pytest.mark.parametrize("rows,points,chunk", [(1000, 50, 1000), (1000, 50, 7), (2500, 3, 333), (997, 101, 64), (40, 100, 5)])
+def test_lttb_matches_reference(rows, points, chunk):
+    t, v = random_walk(rows)
+    assert downsample_in_chunks(t, v, points, 'lttb', chunk) == reference_lttb(t, v, points)
+
+def test_lttb_matches_reference_when_candidates_are_reduced(monkeypatch):
+    # Buckets of about 500 rows, reduced to their hull (which stays under the cap) every few chunks
+    reductions = []
+    def counting_hull(t, v):
+        reductions.append(len(t))
+        return convex_hull_indexes(t, v)
+    monkeypatch.setattr(downsample, "LTTB_MAX_CANDIDATES", 128)
+    monkeypatch.setattr(downsample, "convex_hull_indexes", counting_hull)
+    t, v = random_walk(5000, seed=1)
+    assert downsample_in_chunks(t, v, 12, 'lttb', 100) == reference_lttb(t, v, 12)
+    assert reductions
+
+def test_convex_hull_keeps_only_hull_points():
+    t = np.array([0.0, 1.0, 1.0, 2.0, 3.0, 4.0, 4.0])
+    v = np.array([0.0, 2.0, -1.0, 0.5, 0.0, 3.0, 0.0])
+    assert convex_hull_indexes(t, v).tolist() == [0, 1, 2, 5, 6]
+
+def test_lttb_keeps_point_count_and_endpoints():
+    t, v = random_walk(10_000, seed=2)
+    timestamps, values = downsample_in_chunks(t, v, 300, 'lttb', 1024)
+    assert len(timestamps) == 300
+    assert (timestamps[0], values[0]) == (t[0], v[0])
+    assert (timestamps[-1], values[-1]) == (t[-1], v[-1])
+    assert timestamps == sorted(timestamps)
+
+@pytest.mark.parametrize("rows", [1, 2, 3])
+def test_lttb_short_series_are_returned_whole(rows):
+    t, v = random_walk(rows)
+    assert downsample_in_chunks(t, v, 10, 'lttb', 1) == (t.tolist(), v.tolist())
+
+def test_minmax_keeps_each_buckets_extremes_in_time_order():
+    t, v = random_walk(1000, seed=3)
+    timestamps, values = downsample_in_chunks(t, v, 20, 'minmax', 37)
+    expected = []
+    for bucket in np.array_split(np.arange(1000), 10):
+        expected.extend(sorted({bucket[np.argmin(v[bucket])], bucket[np.argmax(v[bucket])]}))
+    assert timestamps == t[expected].tolist()
+    assert values == v[expected].tolist()
+    assert len(timestamps) <= 20
+
+def test_rows_beyond_the_counted_total_join_the_last_bucket():
+    t, v = random_walk(1200, seed=4)
+    downsampler = StreamingDownsampler(1000, 50, 'lttb')
+    downsampler.feed(t, v)
+    timestamps, _ = downsampler.finish()
+    assert len(timestamps) == 50
+    assert timestamps[-1] == t[-1]
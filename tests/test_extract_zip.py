@@ -0,0 +1,47 @@
+import io
+import zipfile
+from app.utils.extract_zip import list_zip_csv_members, open_csv_source, source_mtime
+from app.utils.save_csv_data import find_csv_files
+
+def zip_bytes(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+        for name, payload in members.items():
+            zip_ref.writestr(name, payload)
+    return buffer.getvalue()
+
+def write_nested_archive(path):
+    innermost = zip_bytes({"c.csv": b"Ticker\nC.NSE\n" * 3})
+    inner = zip_bytes({"b.csv": b"Ticker\nB.NSE\n", "deeper/c.zip": innermost, "notes.txt": b"skip me"})
+    path.write_bytes(zip_bytes({"a.csv": b"Ticker\nA.NSE\n" * 2, "2022-04/b.zip": inner, "empty/": b""}))
+
+def test_nested_members_are_listed_with_their_sizes(tmp_path):
+    archive = tmp_path / "ticks.zip"
+    write_nested_archive(archive)
+    members = dict(list_zip_csv_members(str(archive)))
+    assert members == {
+        f"{archive}!a.csv": 26,
+        f"{archive}!2022-04/b.zip!b.csv": 13,
+        f"{archive}!2022-04/b.zip!deeper/c.zip!c.csv": 39,
+    }
+    for source, size in members.items():
+        with open_csv_source(source) as f:
+            assert len(f.read()) == size
+
+def test_find_csv_files_combines_plain_files_and_members(tmp_path):
+    write_nested_archive(tmp_path / "ticks.zip")
+    (tmp_path / "day").mkdir()
+    (tmp_path / "day" / "plain.csv").write_bytes(b"Ticker\nP.NSE\n")
+    files = find_csv_files(str(tmp_path))
+    assert files[str(tmp_path / "day" / "plain.csv")] == 13
+    assert len(files) == 4
+
+def test_members_take_the_mtime_of_their_archive(tmp_path):
+    archive = tmp_path / "ticks.zip"
+    write_nested_archive(archive)
+    assert source_mtime(f"{archive}!2022-04/b.zip!b.csv") == archive.stat().st_mtime
+
+def test_invalid_archive_lists_nothing(tmp_path):
+    archive = tmp_path / "broken.zip"
+    archive.write_bytes(b"not a zip")
+    assert list_zip_csv_members(str(archive)) == []
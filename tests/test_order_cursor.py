@@ -0,0 +1,28 @@
+import uuid
+import base64
+import pytest
+from datetime import datetime, timezone
+from fastapi import HTTPException
+from app.services.v1.tick_service import encode_order_cursor, decode_order_cursor
+
+def test_cursor_round_trip():
+    order_id = uuid.uuid4()
+    for timestamp in (datetime(2022, 4, 5, 9, 15, 1), datetime(2022, 4, 5, 9, 15, 1, 250000, tzinfo=timezone.utc)):
+        assert decode_order_cursor(encode_order_cursor(timestamp, order_id)) == (timestamp, order_id)
+
+def test_cursor_is_url_safe():
+    cursor = encode_order_cursor(datetime(2022, 4, 5, 9, 15), uuid.uuid4())
+    assert all(c.isalnum() or c in "-_=" for c in cursor)
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    base64.urlsafe_b64encode(b"2022-04-05T09:15:00").decode(),
+    base64.urlsafe_b64encode(b"yesterday|" + str(uuid.uuid4()).encode()).decode(),
+    base64.urlsafe_b64encode(b"2022-04-05T09:15:00|not-a-uuid").decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+])
+def test_bad_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_order_cursor(cursor)
+    assert error.value.status_code == 400
@@ -0,0 +1,39 @@
+import csv
+from datetime import datetime
+from benchmarks.parser_benchmark import legacy_parse, fast_parse
+from benchmarks.synthetic_ticks import generate_dataset
+from app.utils.tick_parser import REQUIRED_HEADERS, column_indexes, decode_chunk_columns, parse_tick_rows, seconds_of_day
+
+def test_fast_parser_matches_legacy_parser(tmp_path):
+    for path in generate_dataset(tmp_path, tickers=5, days=2, rows=500):
+        assert list(fast_parse(path)) == list(legacy_parse(path))
+
+def test_chunk_decoder_matches_legacy_parser(tmp_path):
+    path = generate_dataset(tmp_path, tickers=5, days=1, rows=500)[0]
+    expected = list(legacy_parse(path))
+    with open(path, encoding='utf-8') as csv_file:
+        reader = csv.reader(csv_file)
+        index = column_indexes(next(reader))
+        columns = decode_chunk_columns(list(reader), index)
+
+    assert [timestamp.item() for timestamp in columns['timestamp']] == [row['timestamp'] for row in expected]
+    for name in ('ltp', 'buyprice', 'buyqty', 'sellprice', 'sellqty', 'ltq', 'openinterest', 'ticker'):
+        assert columns[name].tolist() == [row[name] for row in expected]
+
+def test_column_indexes_follow_the_header_order():
+    header = list(reversed(REQUIRED_HEADERS)) + ["Extra"]
+    index = column_indexes(header)
+    assert all(header[index[name]] == name for name in REQUIRED_HEADERS)
+    assert column_indexes(REQUIRED_HEADERS[:-1]) is None
+    assert column_indexes(None) is None
+
+def test_parser_handles_unpadded_times_and_date_changes():
+    index = column_indexes(REQUIRED_HEADERS)
+    rows = [
+        ["ABC.NSE", "05/04/2022", "9:15:00", "1.5", "1.4", "10", "1.6", "20", "3", "100"],
+        ["ABC.NSE", "06/04/2022", "15:29:59", "2.5", "2.4", "11", "2.6", "21", "4", "101"],
+    ]
+    parsed = list(parse_tick_rows(rows, index))
+    assert [row['timestamp'] for row in parsed] == [datetime(2022, 4, 5, 9, 15), datetime(2022, 4, 6, 15, 29, 59)]
+    assert parsed[0]['ticker'] == "ABC"
+    assert seconds_of_day(["9:15:00", "15:29:59"]).tolist() == [33300, 55799]